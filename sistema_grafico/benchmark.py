@@ -0,0 +1,399 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import median
+from subprocess import run, CalledProcessError
+from time import perf_counter
+from typing import Callable
+import json
+import platform
+
+import numpy
+from numpy import ndarray, arange, concatenate, cos, sin, pi, stack
+from numpy.random import Generator, default_rng
+
+from controller import Controller
+from model import (
+    Coordinates,
+    Area2d,
+    Color,
+    Point,
+    Line,
+    Wireframe,
+    Curve2D,
+    clip_lines,
+    tessellate_curves,
+)
+
+# Scenes are spread a bit past the window, so part of them is clipped
+SCENE_EXTENT = 1.5
+STAR_SPIKES = 8
+CHAIN_SEGMENTS = 32
+DEFAULT_SIZES = [1000, 10000]
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 5420
+
+
+@dataclass
+class Recording_Drawer:
+    # Headless drawer that only counts what it is asked to draw
+    controller: Controller
+    _viewport: Area2d = field(
+        default_factory=lambda: Area2d(Coordinates(50, 50), Coordinates(750, 750))
+    )
+    calls: Counter = field(default_factory=Counter)
+    vertexes_count: int = 0
+    # Callbacks the controller scheduled, only run when update is called
+    _pending: list[Callable[[], None]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.controller.set_drawer(self)
+
+    def reset(self):
+        self.calls.clear()
+        self.vertexes_count = 0
+
+    def update(self):
+        while self._pending:
+            pending, self._pending = self._pending, list()
+            for callback in pending:
+                callback()
+
+    def clear(self):
+        self.calls["clear"] += 1
+
+    def after_idle(self, callback: Callable[[], None]):
+        self._pending.append(callback)
+
+    def after(self, milliseconds: int, callback: Callable[[], None]):
+        self._pending.append(callback)
+
+    def begin_drawable(self, name: str):
+        self.calls["begin_drawable"] += 1
+
+    def end_frame(self):
+        self.calls["end_frame"] += 1
+
+    def insert_drawables(self, names: list[str]):
+        pass
+
+    def clear_drawables(self):
+        pass
+
+    def draw_point(self, coordinates: Coordinates, color: Color):
+        self.calls["draw_point"] += 1
+        self.vertexes_count += 1
+
+    def draw_line(self, endpoint1: Coordinates, endpoint2: Coordinates, color: Color):
+        self.calls["draw_line"] += 1
+        self.vertexes_count += 2
+
+    def draw_polyline(self, vertexes: ndarray, color: Color):
+        self.calls["draw_polyline"] += 1
+        self.vertexes_count += len(vertexes)
+
+    def draw_polygon_outline(self, vertexes: ndarray, color: Color):
+        self.calls["draw_polygon_outline"] += 1
+        self.vertexes_count += len(vertexes)
+
+    def draw_wireframe_filled(self, vertexes: ndarray, color: Color):
+        self.calls["draw_wireframe_filled"] += 1
+        self.vertexes_count += len(vertexes)
+
+    def draw_viewport_border(self):
+        self.calls["draw_viewport_border"] += 1
+
+
+def generate_points(rng: Generator, count: int) -> ndarray:
+    return rng.uniform(-SCENE_EXTENT, SCENE_EXTENT, (count, 2))
+
+
+def generate_lines(rng: Generator, count: int) -> ndarray:
+    # Short lines in every direction, as rows of x1, y1, x2, y2
+    centers = rng.uniform(-SCENE_EXTENT, SCENE_EXTENT, (count, 2))
+    angles = rng.uniform(0, pi, count)
+    half_lengths = rng.uniform(0.005, 0.1, count)
+    half_directions = stack((cos(angles), sin(angles)), axis=1) * half_lengths[:, None]
+    return concatenate((centers - half_directions, centers + half_directions), axis=1)
+
+
+def generate_wireframes(rng: Generator, count: int) -> list[ndarray]:
+    # Concave stars of STAR_SPIKES spikes, of different sizes and rotations
+    centers = rng.uniform(-SCENE_EXTENT, SCENE_EXTENT, (count, 1, 2))
+    outer_radiuses = rng.uniform(0.005, 0.05, (count, 1))
+    rotations = rng.uniform(0, 2 * pi, (count, 1))
+
+    angles = rotations + arange(2 * STAR_SPIKES) * pi / STAR_SPIKES
+    radiuses = outer_radiuses * (1 - 0.6 * (arange(2 * STAR_SPIKES) % 2))
+    offsets = stack((cos(angles), sin(angles)), axis=2) * radiuses[:, :, None]
+    return list(centers + offsets)
+
+
+def generate_curves(rng: Generator, count: int) -> list[ndarray]:
+    # Random walks of CHAIN_SEGMENTS cubic segments each
+    starts = rng.uniform(-SCENE_EXTENT, SCENE_EXTENT, (count, 1, 2))
+    steps = rng.normal(0, 0.01, (count, 3 * CHAIN_SEGMENTS, 2))
+    return list(concatenate((starts, starts + steps.cumsum(axis=1)), axis=1))
+
+
+def create_scene(controller: Controller, scene: str, size: int, seed: int):
+    rng = default_rng(seed)
+    match scene:
+        case "points":
+            controller.create_points(generate_points(rng, size), Color.BLACK)
+
+        case "lines":
+            controller.create_lines(generate_lines(rng, size), Color.BLUE)
+
+        case "wireframes":
+            controller.create_wireframes(
+                generate_wireframes(rng, size), Color.RED, False
+            )
+
+        case "curves":
+            controller.create_drawables(
+                [
+                    Curve2D(vertexes, Color.GREEN)
+                    for vertexes in generate_curves(rng, size)
+                ]
+            )
+
+
+SCENES = ["points", "lines", "wireframes", "curves"]
+
+
+def measure(
+    function: Callable[[], object],
+    repeat: int,
+    setup: Callable[[], object] | None = None,
+) -> dict[str, float]:
+    times = list()
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+
+    return {"best": min(times), "median": median(times)}
+
+
+def get_clippers(
+    controller: Controller, drawables_NDC: list
+) -> dict[str, Callable[[], object]]:
+    # Every clipping implementation that applies to the drawables of a scene
+    tolerance = controller.get_curve_tolerance_NDC()
+    match drawables_NDC[0]:
+        case Point():
+            return {"clip_NDC": lambda: [point.clip_NDC() for point in drawables_NDC]}
+
+        case Line():
+            return {
+                "Cohen_Sutherland": lambda: [
+                    line.clip_line_Cohen_Sutherland() for line in drawables_NDC
+                ],
+                "Liang_Barsky": lambda: [
+                    line.clip_line_Liang_Barsky() for line in drawables_NDC
+                ],
+                "Cohen_Sutherland_batch": lambda: clip_lines(drawables_NDC, True),
+                "Liang_Barsky_batch": lambda: clip_lines(drawables_NDC, False),
+            }
+
+        case Wireframe():
+            return {
+                "Sutherland_Hodgman": lambda: [
+                    wireframe.clip_Sutherland_Hodgman() for wireframe in drawables_NDC
+                ],
+                "Weiler_Atherton": lambda: [
+                    wireframe.clip_Weiler_Atherton() for wireframe in drawables_NDC
+                ],
+            }
+
+        case Curve2D():
+            return {
+                "Cohen_Sutherland": lambda: [
+                    curve.clip_NDC(True, tolerance) for curve in drawables_NDC
+                ],
+                "Liang_Barsky": lambda: [
+                    curve.clip_NDC(False, tolerance) for curve in drawables_NDC
+                ],
+            }
+
+
+def run_benchmark(
+    results: list[dict],
+    scene: str,
+    size: int,
+    benchmark: str,
+    function: Callable[[], object],
+    repeat: int,
+    setup: Callable[[], object] | None = None,
+) -> dict:
+    result = {"scene": scene, "size": size, "benchmark": benchmark}
+    try:
+        result.update(measure(function, repeat, setup))
+    except Exception as error:
+        # A failing implementation is reported, the others are still measured
+        result["error"] = repr(error)
+
+    results.append(result)
+    print(
+        f"{scene:>10} {size:>8} {benchmark:<40}",
+        result.get("error") or f"{result['best'] * 1000:10.2f} ms",
+    )
+    return result
+
+
+def benchmark_scene(scene: str, size: int, seed: int, repeat: int) -> list[dict]:
+    controller = Controller()
+    drawer = Recording_Drawer(controller)
+    results = list()
+
+    def invalidate_NDC():
+        controller._transformation_NDC_version += 1
+
+    run_benchmark(
+        results,
+        scene,
+        size,
+        "create",
+        lambda: create_scene(controller, scene, size, seed),
+        1,
+    )
+    run_benchmark(
+        results,
+        scene,
+        size,
+        "transform_display_file_NDC",
+        controller.transform_display_file_NDC,
+        repeat,
+        invalidate_NDC,
+    )
+
+    drawables_NDC = list(controller._display_file_NDC.values())
+    for name, clipper in get_clippers(controller, drawables_NDC).items():
+        run_benchmark(results, scene, size, f"clip/{name}", clipper, repeat)
+
+    if scene == "curves":
+        tolerance = controller.get_curve_tolerance_NDC()
+        run_benchmark(
+            results,
+            scene,
+            size,
+            "tessellate/tessellate_curves",
+            lambda: tessellate_curves(drawables_NDC, tolerance),
+            repeat,
+        )
+        run_benchmark(
+            results,
+            scene,
+            size,
+            "tessellate/Curve2D.tessellate",
+            lambda: [curve.tessellate(tolerance) for curve in drawables_NDC],
+            repeat,
+        )
+
+    # Wireframes are redrawn with each polygon clipping too
+    polygon_clippings = {"": controller._clip_polygon_default}
+    if scene == "wireframes":
+        polygon_clippings = {"/Weiler_Atherton": True, "/Sutherland_Hodgman": False}
+
+    for suffix, polygon_default in polygon_clippings.items():
+        controller.set_clip_polygon_default(polygon_default)
+
+        result = run_benchmark(
+            results,
+            scene,
+            size,
+            f"redraw{suffix}",
+            controller.redraw,
+            repeat,
+            drawer.reset,
+        )
+        result["drawer_calls"] = dict(drawer.calls)
+        result["drawer_vertexes"] = drawer.vertexes_count
+        frame = controller.get_frame_statistics().get_last_frame()
+        if "error" not in result and frame is not None:
+            result["phases"] = frame.phases
+            result["counts"] = dict(frame.counts)
+
+        run_benchmark(
+            results,
+            scene,
+            size,
+            f"redraw_transformed{suffix}",
+            controller.redraw,
+            repeat,
+            invalidate_NDC,
+        )
+
+    return results
+
+
+def get_commit() -> str | None:
+    try:
+        output = run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def compare(results: dict, baseline: dict):
+    # Ratio of every best time to the one of the same benchmark in the baseline
+    baseline_times = {
+        (result["scene"], result["size"], result["benchmark"]): result["best"]
+        for result in baseline["results"]
+        if "best" in result
+    }
+    print(f"\nCompared to {baseline.get('commit')}")
+    for result in results["results"]:
+        key = (result["scene"], result["size"], result["benchmark"])
+        if "best" not in result or key not in baseline_times:
+            continue
+        ratio = result["best"] / baseline_times[key]
+        print(f"{key[0]:>10} {key[1]:>8} {key[2]:<40} {ratio:6.2f}x")
+
+
+def main():
+    parser = ArgumentParser(
+        description="Times transforming, clipping, tessellating and redrawing "
+        "seeded synthetic scenes"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--scenes", nargs="+", choices=SCENES, default=SCENES)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", type=Path, default=Path("benchmark.json"))
+    parser.add_argument("--baseline", type=Path, help="Results to compare with")
+    arguments = parser.parse_args()
+
+    results = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "seed": arguments.seed,
+        "repeat": arguments.repeat,
+        "results": list(),
+    }
+    for size in arguments.sizes:
+        for scene in arguments.scenes:
+            results["results"].extend(
+                benchmark_scene(scene, size, arguments.seed, arguments.repeat)
+            )
+
+    arguments.output.write_text(json.dumps(results, indent=2))
+
+    if arguments.baseline is not None:
+        compare(results, json.loads(arguments.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    main()
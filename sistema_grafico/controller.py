@@ -1,17 +1,60 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Optional
-
-from model import Coordinates, Point, Line, Wireframe, Drawable, Area2d, Color, Curve2D
-from math import sin, cos, radians
-from numpy import double, dot
-from copy import deepcopy
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from model import (
+    Coordinates,
+    Point,
+    Line,
+    Wireframe,
+    Polyline,
+    Simplified_Geometry,
+    Drawable,
+    Area2d,
+    Color,
+    Curve2D,
+    const,
+    WINDOW_NDC,
+    as_vertex_array,
+    transform_vertexes,
+    transform_drawables,
+    clip_lines,
+    tessellate_curves,
+)
+from spatial_index import Spatial_Index
+from obj_file import read_obj, write_obj, WRITE_BUFFER_SIZE
+from scene_file import read_scene, write_scene
+from frame_statistics import Frame_Statistics
+from math import sin, cos, radians, ceil, inf
+from time import perf_counter
+from itertools import chain, repeat
+from numpy import (
+    double,
+    dot,
+    ndarray,
+    column_stack,
+    array,
+    asarray,
+    float64,
+    sqrt,
+    concatenate,
+    cumsum,
+)
+from numpy.linalg import inv, det
 from pathlib import Path
-import re
+from io import StringIO
 
 if TYPE_CHECKING:
     from view import Graphic_Viewer
 
+NAME_PREFIXES = {
+    Point: "Point",
+    Line: "Line",
+    Wireframe: "Wireframe",
+    Polyline: "Polyline",
+    Curve2D: "Curve",
+}
+
 
 @dataclass
 class Controller:
@@ -24,39 +67,73 @@ class Controller:
     _transformation_NDC: list[list[int | double | float]] = field(
         default_factory=lambda: [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
     )
+    _transformation_NDC_version: int = 0
+    # Drawable and window versions, and the coarseness, each entry of the NDC
+    # display file was made with
+    _display_file_NDC_versions: dict[str, tuple[int, int, float]] = field(
+        default_factory=dict
+    )
+    _spatial_index: Spatial_Index = field(default_factory=Spatial_Index)
+    _name_counters: dict[str, int] = field(default_factory=dict)
     _clip_default: bool = True
+    _clip_polygon_default: bool = True
+    # Curves are tessellated until they are this many pixels away from the
+    # exact curve, None samples them with their own fixed step instead
+    _curve_tolerance: float | None = 0.5
+    # Same for simplifying big wireframes, None always draws all of their vertexes
+    _level_of_detail_tolerance: float | None = 0.5
+    # Changes only schedule a redraw, all of them until the drawer is idle are
+    # drawn in one frame, with at least this many milliseconds between frames
+    _frame_interval: int = 16
+    _redraw_pending: bool = False
+    _last_frame_time: float = -inf
+    # Progressive redraws draw this many drawables at a time, for up to
+    # _frame_budget milliseconds before letting the drawer handle its events
+    _progressive_redraw: bool = False
+    _redraw_chunk_size: int = 200
+    _frame_budget: float = 10
+    _redraw_generation: int = 0
+    # NDC to viewport matrix and the viewport it was made for
+    _viewport_transformation: ndarray | None = None
+    _viewport_transformation_key: tuple[float, float, float, float] | None = None
+    _frame_statistics: Frame_Statistics = field(default_factory=Frame_Statistics)
 
     def set_clip_default(self, default: bool) -> None:
         self._clip_default = default
-        self.redraw()
-
-    def transform_window_to_viewport(self, drawable_in_window: Coordinates):
-        x_w_max = 1
-        x_w_min = -1
-        x_vp_max = self._drawer._viewport.max.x
-        x_vp_min = self._drawer._viewport.min.x
-
-        y_w_max = 1
-        y_w_min = -1
-        y_vp_max = self._drawer._viewport.max.y
-        y_vp_min = self._drawer._viewport.min.y
+        self.schedule_redraw()
+
+    def set_progressive_redraw(self, progressive: bool) -> None:
+        self._progressive_redraw = progressive
+        self.schedule_redraw()
+
+    def set_clip_polygon_default(self, default: bool) -> None:
+        self._clip_polygon_default = default
+        self.schedule_redraw()
+
+    def get_viewport_transformation(self) -> ndarray:
+        # Matrix from NDC to the viewport, made again only when the viewport
+        # of the drawer changes
+        viewport = self._drawer._viewport
+        key = (viewport.min.x, viewport.min.y, viewport.max.x, viewport.max.y)
+        if key != self._viewport_transformation_key:
+            min_x, min_y, max_x, max_y = key
+            self._viewport_transformation = array(
+                [
+                    [(max_x - min_x) / 2, 0, 0],
+                    [0, -(max_y - min_y) / 2, 0],
+                    [(min_x + max_x) / 2, (min_y + max_y) / 2, 1],
+                ],
+                dtype=float64,
+            )
+            self._viewport_transformation_key = key
 
-        viewport_x = (
-            (drawable_in_window.x - x_w_min)
-            / (x_w_max - x_w_min)
-            * (x_vp_max - x_vp_min)
-        )
-        viewport_y = (1 - ((drawable_in_window.y - y_w_min) / (y_w_max - y_w_min))) * (
-            y_vp_max - y_vp_min
-        )
+        return self._viewport_transformation
 
-        viewport_coordinates = Coordinates(
-            viewport_x + self._drawer._viewport.min.x,
-            viewport_y + self._drawer._viewport.min.y,
+    def transform_window_to_viewport_array(self, vertexes: ndarray) -> ndarray:
+        return transform_vertexes(
+            as_vertex_array(vertexes), self.get_viewport_transformation()
         )
 
-        return viewport_coordinates
-
     def transform_viewport_to_window(self, viewport_coordinates: Coordinates):
         x_w_max = self._window.max.x
         x_w_min = self._window.min.x
@@ -80,31 +157,121 @@ class Controller:
 
         return window_coordinates
 
+    def get_pixel_size_NDC(self) -> float:
+        viewport_size = self._drawer._viewport.size()
+        return 2 / min(viewport_size.x, viewport_size.y)
+
+    def get_pixel_size(self) -> float:
+        # World units covered by a pixel, from the scale of the window matrix
+        matrix = array(self._transformation_NDC, dtype=float64)[:2, :2]
+        return self.get_pixel_size_NDC() / sqrt(abs(det(matrix)))
+
+    def get_curve_tolerance_NDC(self, coarseness: float = 1) -> float | None:
+        if self._curve_tolerance is None:
+            return None
+
+        return self._curve_tolerance * self.get_pixel_size_NDC() * coarseness
+
+    def has_level_of_detail(self, drawable: Drawable) -> bool:
+        # Big wireframes are simplified to what can be seen at this zoom
+        return (
+            self._level_of_detail_tolerance is not None
+            and isinstance(drawable, Simplified_Geometry)
+            and len(drawable.vertexes) >= const.LEVEL_OF_DETAIL_MIN_VERTEXES
+        )
+
+    def get_level_of_detail(self, drawable: Drawable, pixel_size: float) -> Drawable:
+        if not self.has_level_of_detail(drawable):
+            return drawable
+
+        vertexes = drawable.get_level_of_detail(
+            self._level_of_detail_tolerance * pixel_size
+        )
+        if len(vertexes) == len(drawable.vertexes):
+            return drawable
+
+        return drawable.with_vertexes(vertexes)
+
+    def get_frame_statistics(self) -> Frame_Statistics:
+        return self._frame_statistics
+
     def set_drawer(self, drawer: Graphic_Viewer):
         self._drawer = drawer
 
     def new_name(self, prefix: str):
-        index = 1
+        # Numbering goes on from the last name given, not from 1 every time
+        index = self._name_counters.get(prefix, 0) + 1
         while True:
             name = prefix + str(index)
             if name not in self._display_file:
                 break
             index += 1
 
+        self._name_counters[prefix] = index
         return name
 
+    def create_drawables(
+        self, drawables: Iterable[Drawable], names: Iterable[str | None] | None = None
+    ) -> list[str]:
+        # Every drawable is added with a single listbox insert, NDC transform
+        # and redraw
+        if names is None:
+            names = repeat(None)
+
+        all_names = list()
+        new_names = list()
+        for drawable, name in zip(drawables, names):
+            if name is None:
+                name = self.new_name(NAME_PREFIXES[type(drawable)])
+            if name not in self._display_file:
+                new_names.append(name)
+            self._display_file[name] = drawable
+            all_names.append(name)
+
+        bounding_boxes = [
+            self._display_file[name].get_bounding_box() for name in all_names
+        ]
+        self._spatial_index.insert_many(all_names, bounding_boxes)
+        self._drawer.insert_drawables(new_names)
+
+        # The rest are transformed when the window gets to them
+        window = self.get_window_area()
+        self.update_display_file_NDC(
+            [
+                name
+                for name, bounding_box in zip(all_names, bounding_boxes)
+                if window.intersects(bounding_box)
+            ]
+        )
+        self.schedule_redraw()
+        return all_names
+
+    def create_points(self, coordinates: ndarray, color: Color) -> list[str]:
+        return self.create_drawables(
+            Point(Coordinates(x, y), color)
+            for x, y in as_vertex_array(coordinates).tolist()
+        )
+
+    def create_lines(self, endpoints: ndarray, color: Color) -> list[str]:
+        # One line per row of x1, y1, x2, y2
+        return self.create_drawables(
+            Line(Coordinates(x1, y1), Coordinates(x2, y2), color)
+            for x1, y1, x2, y2 in asarray(endpoints, dtype=float64)
+            .reshape(-1, 4)
+            .tolist()
+        )
+
+    def create_wireframes(
+        self, all_vertexes: Iterable[ndarray], color: Color, filled: bool
+    ) -> list[str]:
+        return self.create_drawables(
+            Wireframe(vertexes, color, filled) for vertexes in all_vertexes
+        )
+
     def create_point_w_coordinates(
         self, coordinate: Coordinates, color: Color, name: str = None
     ):
-        if name is None:
-            name = self.new_name("Point")
-        point = Point(coordinate, color)
-        self._display_file[name] = point
-        self._drawer.insert_drawable(name)
-        point_NDC = deepcopy(point)
-        point_NDC.transform(self._transformation_NDC)
-        self._display_file_NDC[name] = point_NDC
-        self.redraw()
+        self.create_drawables([Point(coordinate, color)], [name])
 
     def create_point(self, x: int, y: int, color: Color):
         self.create_point_w_coordinates(Coordinates(x, y), color)
@@ -116,15 +283,7 @@ class Controller:
         color: Color,
         name: str = None,
     ):
-        if name is None:
-            name = self.new_name("Line")
-        line = Line(endpoint1, endpoint2, color)
-        self._display_file[name] = line
-        self._drawer.insert_drawable(name)
-        line_NDC = deepcopy(line)
-        line_NDC.transform(self._transformation_NDC)
-        self._display_file_NDC[name] = line_NDC
-        self.redraw()
+        self.create_drawables([Line(endpoint1, endpoint2, color)], [name])
 
     def create_line(self, x1: int, y1: int, x2: int, y2: int, color: Color):
         endpoint1 = Coordinates(x1, y1)
@@ -134,20 +293,12 @@ class Controller:
 
     def create_wireframe_w_coordinates(
         self,
-        coordinates: list[Coordinates],
+        coordinates: list[Coordinates] | ndarray,
         color: Color,
         filled: bool,
         name: str = None,
     ):
-        if name is None:
-            name = self.new_name("Wireframe")
-        wireframe = Wireframe(coordinates, color, filled)
-        self._display_file[name] = wireframe
-        self._drawer.insert_drawable(name)
-        wireframe_NDC = deepcopy(wireframe)
-        wireframe_NDC.transform(self._transformation_NDC)
-        self._display_file_NDC[name] = wireframe_NDC
-        self.redraw()
+        self.create_drawables([Wireframe(coordinates, color, filled)], [name])
 
     def create_wireframe(
         self,
@@ -156,38 +307,268 @@ class Controller:
         color: Color,
         filled: bool,
     ):
-        coordinates = list()
-        for i in range(len(list_x)):
-            coordinate = Coordinates(list_x[i], list_y[i])
-            coordinates.append(coordinate)
+        coordinates = column_stack((list_x, list_y))
 
         self.create_wireframe_w_coordinates(coordinates, color, filled)
     
     def create_curve_w_coordinates(
         self, 
-        all_coordinates: list[Coordinates], 
+        all_coordinates: list[Coordinates] | ndarray,
         color: Color,
         name: str = None,
     ):
-        if name is None:
-            name = self.new_name("Curve")
-        curve2d = Curve2D(all_coordinates, color)
-        self._display_file[name] = curve2d
-        self._drawer.insert_drawable(name)
-        curve2d_NDC = deepcopy(curve2d)
-        curve2d_NDC.transform(self._transformation_NDC)
-        self._display_file_NDC[name] = curve2d_NDC
-        self.redraw()
+        self.create_drawables([Curve2D(all_coordinates, color)], [name])
+
+    def index_drawable(self, name: str) -> None:
+        self._spatial_index.insert(name, self._display_file[name].get_bounding_box())
+
+    def get_window_area(self) -> Area2d:
+        # The NDC window mapped back to the world, as an axis aligned area
+        corners_NDC = array(
+            [
+                [const.WINDOW_NDC_MIN_X, const.WINDOW_NDC_MIN_Y, 1],
+                [const.WINDOW_NDC_MIN_X, const.WINDOW_NDC_MAX_Y, 1],
+                [const.WINDOW_NDC_MAX_X, const.WINDOW_NDC_MIN_Y, 1],
+                [const.WINDOW_NDC_MAX_X, const.WINDOW_NDC_MAX_Y, 1],
+            ],
+            dtype=float64,
+        )
+        corners = corners_NDC @ inv(array(self._transformation_NDC, dtype=float64))
+        min_x, min_y = corners[:, :2].min(axis=0)
+        max_x, max_y = corners[:, :2].max(axis=0)
+        return Area2d(Coordinates(min_x, min_y), Coordinates(max_x, max_y))
+
+    def get_visible_names(self) -> list[str]:
+        return self._spatial_index.query(self.get_window_area())
+
+    def update_display_file_NDC(self, names: list[str], coarseness: float = 1) -> None:
+        # Coarseness only changes the drawables with levels of detail, the
+        # rest are kept for every coarseness
+        stale_names = list()
+        stale_versions = list()
+        for name in names:
+            drawable = self._display_file[name]
+            versions = (
+                drawable.version,
+                self._transformation_NDC_version,
+                coarseness if self.has_level_of_detail(drawable) else 1,
+            )
+            if self._display_file_NDC_versions.get(name) != versions:
+                stale_names.append(name)
+                stale_versions.append(versions)
+
+        pixel_size = self.get_pixel_size() * coarseness
+        drawables_NDC = transform_drawables(
+            [
+                self.get_level_of_detail(self._display_file[name], pixel_size)
+                for name in stale_names
+            ],
+            self._transformation_NDC,
+        )
+
+        for name, drawable_NDC, versions in zip(
+            stale_names, drawables_NDC, stale_versions
+        ):
+            self._display_file_NDC[name] = drawable_NDC
+            self._display_file_NDC_versions[name] = versions
+
+    def evict_display_file_NDC(self, names: list[str]) -> None:
+        # Entries out of the window can hold on to the arrays of whole batches
+        # they were transformed with, so only the ones of the frame are kept
+        kept_names = set(names)
+        for name in [name for name in self._display_file_NDC if name not in kept_names]:
+            del self._display_file_NDC[name]
+            del self._display_file_NDC_versions[name]
+
+    def schedule_redraw(self):
+        if self._redraw_pending:
+            return
+        self._redraw_pending = True
+
+        wait = self._frame_interval - (perf_counter() - self._last_frame_time) * 1000
+        if wait > 0:
+            self._drawer.after(ceil(wait), self.flush_redraw)
+        else:
+            self._drawer.after_idle(self.flush_redraw)
+
+    def flush_redraw(self):
+        if not self._redraw_pending:
+            return
+
+        if self._progressive_redraw:
+            self.redraw_progressive()
+        else:
+            self.redraw()
 
     def redraw(self):
+        self._redraw_pending = False
+        self._last_frame_time = perf_counter()
+        self._redraw_generation += 1
+
+        for _ in self.redraw_chunks(self.get_visible_names()):
+            pass
+
+    def redraw_progressive(self):
+        self._redraw_pending = False
+        self._last_frame_time = perf_counter()
+        self._redraw_generation += 1
+
+        # Big scenes are drawn coarsely first, then with all of their detail
+        names = self.get_visible_names()
+        frames = [self.redraw_chunks(names, 1, self._redraw_chunk_size)]
+        if len(names) > self._redraw_chunk_size:
+            frames.insert(
+                0,
+                self.redraw_chunks(
+                    names, const.REDRAW_COARSENESS, self._redraw_chunk_size
+                ),
+            )
+
+        self.continue_redraw(self._redraw_generation, chain(*frames))
+
+    def continue_redraw(self, generation: int, chunks: Iterator[None]):
+        # A newer redraw, or one waiting to start, cancels this one
+        if generation != self._redraw_generation or self._redraw_pending:
+            return
+
+        deadline = perf_counter() + self._frame_budget / 1000
+        for _ in chunks:
+            if perf_counter() >= deadline:
+                self._drawer.after_idle(
+                    lambda: self.continue_redraw(generation, chunks)
+                )
+                return
+
+    def redraw_chunks(
+        self, names: list[str], coarseness: float = 1, chunk_size: int | None = None
+    ) -> Iterator[None]:
+        # Draws a frame, stopping after every chunk of names
+        if chunk_size is None:
+            chunk_size = max(len(names), 1)
+
+        statistics = self._frame_statistics
+        statistics.begin_frame()
+        statistics.count("drawables", len(names))
+        self.evict_display_file_NDC(names)
+        statistics.switch_phase("draw")
         self._drawer.clear()
-        for drawable in self._display_file_NDC.values():
-            drawables_clipped = drawable.clip_NDC(self._clip_default)
-            if drawables_clipped:
-                for drawable_clipped in drawables_clipped:
-                    drawable_clipped.draw(self._drawer)
-            # drawable.draw(self._drawer)
+        for start in range(0, len(names), chunk_size):
+            self.draw_names(names[start : start + chunk_size], coarseness)
+            # Waiting for the rest of a progressive frame is not timed
+            statistics.switch_phase(None)
+            yield
+        statistics.switch_phase("draw")
         self._drawer.draw_viewport_border()
+        self._drawer.end_frame()
+        statistics.end_frame()
+
+    def draw_names(self, names: list[str], coarseness: float = 1):
+        # Only what can intersect the window is transformed and clipped
+        statistics = self._frame_statistics
+        statistics.switch_phase("transform")
+        self.update_display_file_NDC(names, coarseness)
+        statistics.switch_phase("cull")
+
+        # Drawables fully outside the window are skipped and the ones fully
+        # inside it are drawn as they are, only the rest is clipped
+        # Drawables smaller than a pixel are drawn as a point
+        pixel_size_NDC = self.get_pixel_size_NDC() * coarseness
+        names_NDC = list()
+        drawables_NDC = list()
+        drawables_inside = list()
+        for name in names:
+            drawable = self._display_file_NDC[name]
+            bounding_box = drawable.get_bounding_box()
+            if not WINDOW_NDC.intersects(bounding_box):
+                continue
+
+            size = bounding_box.size()
+            if (
+                not isinstance(drawable, Point)
+                and size.x < pixel_size_NDC
+                and size.y < pixel_size_NDC
+            ):
+                center = bounding_box.min + size.multiply_scalar(0.5)
+                drawable = Point(center, drawable.color)
+                bounding_box = drawable.get_bounding_box()
+
+            names_NDC.append(name)
+            drawables_NDC.append(drawable)
+            drawables_inside.append(WINDOW_NDC.contains(bounding_box))
+
+        accepted = sum(drawables_inside)
+        statistics.count("culled", len(names) - len(names_NDC))
+        statistics.count("accepted", accepted)
+        statistics.count("clipped", len(names_NDC) - accepted)
+        statistics.switch_phase("clip")
+
+        # Lines are clipped all at once, the rest one by one
+        lines = [
+            drawable
+            for drawable, inside in zip(drawables_NDC, drawables_inside)
+            if isinstance(drawable, Line) and not inside
+        ]
+        lines_clipped = iter(clip_lines(lines, self._clip_default))
+
+        # Curves are tessellated all at once too, but only where they can be seen
+        statistics.switch_phase("tessellate")
+        curves = [
+            drawable for drawable in drawables_NDC if isinstance(drawable, Curve2D)
+        ]
+        curves_pieces = iter(
+            tessellate_curves(curves, self.get_curve_tolerance_NDC(coarseness))
+        )
+
+        statistics.switch_phase("clip")
+        names_clipped = list()
+        drawables_clipped = list()
+        for name, drawable, inside in zip(names_NDC, drawables_NDC, drawables_inside):
+            if isinstance(drawable, Curve2D):
+                clipped = drawable.clip_tessellated(
+                    next(curves_pieces), self._clip_default
+                )
+            elif inside:
+                clipped = [drawable]
+            elif isinstance(drawable, Line):
+                line_clipped = next(lines_clipped)
+                clipped = [line_clipped] if line_clipped else None
+            elif isinstance(drawable, Wireframe):
+                clipped = drawable.clip_NDC(
+                    self._clip_default, self._clip_polygon_default
+                )
+            else:
+                clipped = drawable.clip_NDC(self._clip_default)
+
+            if not clipped:
+                statistics.count("rejected")
+                continue
+            for drawable_clipped in clipped:
+                names_clipped.append(name)
+                drawables_clipped.append(drawable_clipped)
+
+        # Everything left is mapped to the viewport at once, the drawer gets
+        # each drawable with its slice of the mapped vertexes
+        statistics.switch_phase("draw")
+        if drawables_clipped:
+            all_vertexes = [drawable.get_vertexes() for drawable in drawables_clipped]
+            vertexes_viewport = self.transform_window_to_viewport_array(
+                concatenate(all_vertexes)
+            )
+            statistics.count("vertexes", len(vertexes_viewport))
+            ends = cumsum([len(vertexes) for vertexes in all_vertexes]).tolist()
+        else:
+            ends = list()
+
+        name_drawn = None
+        start = 0
+        for name, drawable_clipped, end in zip(names_clipped, drawables_clipped, ends):
+            if name != name_drawn:
+                self._drawer.begin_drawable(name)
+                name_drawn = name
+            drawable_clipped.with_vertexes(vertexes_viewport[start:end]).draw(
+                self._drawer
+            )
+            start = end
 
     def size_window(self) -> Coordinates:
         return Coordinates(
@@ -257,11 +638,8 @@ class Controller:
         transformations_matrix = self.transform(transformations, center, initial_matrix)
 
         drawable.transform(transformations_matrix)
-
-        drawable_NDC = deepcopy(drawable)
-        drawable_NDC.transform(self._transformation_NDC)
-        self._display_file_NDC[name] = drawable_NDC
-        self.redraw()
+        self.index_drawable(name)
+        self.schedule_redraw()
 
     def transform(
         self,
@@ -299,10 +677,7 @@ class Controller:
         return transformation_matrix
 
     def transform_display_file_NDC(self):
-        self._display_file_NDC = deepcopy(self._display_file)
-        for drawable in self._display_file_NDC.values():
-            drawable.transform(self._transformation_NDC)
-        self.redraw()
+        self.update_display_file_NDC(list(self._display_file))
 
     def transform_window(
         self,
@@ -313,77 +688,59 @@ class Controller:
         self._transformation_NDC = self.transform(
             transformations, Point(Coordinates(0, 0)), self._transformation_NDC
         )
-        self.transform_display_file_NDC()
+        self._transformation_NDC_version += 1
+        self.schedule_redraw()
 
     def export_obj(self, name: str) -> str:
-        drawable = self._display_file[name]
+        output = StringIO()
+        write_obj(output, [(name, self._display_file[name])])
+        return output.getvalue()
 
-        match drawable:
-            case Point():
-                vertexes = [drawable.coordinates]
-
-            case Line():
-                vertexes = [drawable.endpoint1, drawable.endpoint2]
-
-            case Wireframe():
-                vertexes = drawable.vertexes
-
-        output_content = f"o {name}\n"
-        for vertex in vertexes:
-            output_content = (
-                output_content + f"\nv {float(vertex.x)} {float(vertex.y)} 0"
+    def export_scene(
+        self,
+        path: Path | str,
+        curves_tessellated: bool = False,
+        curve_tolerance: float | None = None,
+    ) -> None:
+        with Path(path).open("w", buffering=WRITE_BUFFER_SIZE) as file:
+            write_obj(
+                file, self._display_file.items(), curves_tessellated, curve_tolerance
             )
 
-        output_content = output_content + "\n\nf"
-
-        # Relative
-        #  for i in range(-len(vertexes), 0):
-        #      output_content = output_content + f" {i}"
-
-        # Absolute
-        for i in range(1, len(vertexes) + 1):
-            output_content = output_content + f" {i}"
-
-        return output_content
-
-    def import_obj(self, lines: list[str]) -> None:
-        if re.search("o\s", lines[0]):
-            name = re.sub("o\s", "", lines[0])
-        else:
-            print("Missing name. It will be used a generic name.")
-            name = None
-
-        vertexes = list()
-        coordinates = list()  # 2D
-        for line in lines:
-            if re.search("v\s-?\d+.?\d*\s-?\d+.?\d*\s-?\d+.?\d*", line):
-                numbers = re.sub("v\s", "", line)
-                numbers = numbers.split(" ")
-                numbers = [float(number) for number in numbers]
-                x, y, z = numbers  # z will be used in 3D only
-                vertexes.append(Coordinates(x, y))
-
-            if re.search("f\s-?\d+", line):
-                face = re.sub("f\s", "", line)
-                face = face.split(" ")
-                face = [int(f) for f in face]
-                for index in face:
-                    if index > 0:
-                        coordinates.append(vertexes[index - 1])
-                    if index < 0:
-                        coordinates.append(vertexes[index])
-
-        match len(coordinates):
-            case 0:
-                raise ("Invalid .obj: No vertexes found")
-
-            case 1:
-                self.create_point_w_coordinates(coordinates[0], Color.BLACK, name)
-
-            case 2:
-                self.create_line_w_coordinates(
-                    coordinates[0], coordinates[1], Color.BLACK, name
-                )
-
-            case _:
-                self.create_wireframe_w_coordinates(coordinates, Color.BLACK, name)
+    def save_scene(self, path: Path | str) -> None:
+        write_scene(path, self._display_file.items(), self._transformation_NDC)
+
+    def clear_display_file(self) -> None:
+        self._display_file.clear()
+        self._display_file_NDC.clear()
+        self._display_file_NDC_versions.clear()
+        self._spatial_index = Spatial_Index()
+        self._drawer.clear_drawables()
+        self.schedule_redraw()
+
+    def load_scene(self, path: Path | str) -> list[str]:
+        # The scene replaces everything in the display file, with its window
+        transformation_NDC, drawables = read_scene(path)
+        self.clear_display_file()
+        self._transformation_NDC = transformation_NDC
+        self._transformation_NDC_version += 1
+
+        names = list()
+        all_drawables = list()
+        for name, drawable in drawables:
+            names.append(name)
+            all_drawables.append(drawable)
+
+        return self.create_drawables(all_drawables, names)
+
+    def import_obj(self, path: Path | str) -> list[str]:
+        names = list()
+        drawables = list()
+        for name, drawable in read_obj(path):
+            names.append(name)
+            drawables.append(drawable)
+
+        if not drawables:
+            raise ValueError("Invalid .obj: No vertexes found")
+
+        return self.create_drawables(drawables, names)
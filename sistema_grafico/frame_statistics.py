@@ -0,0 +1,114 @@
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from numpy import percentile
+
+# Frames the percentiles are taken over
+FRAME_HISTORY = 120
+PHASES = ["transform", "cull", "tessellate", "clip", "draw"]
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class Frame:
+    # Seconds spent in each phase, and how long the frame took from its start
+    # to its end, which for progressive redraws includes waiting for the drawer
+    phases: dict[str, float]
+    counts: Counter
+    elapsed: float
+
+    def get_total(self) -> float:
+        return sum(self.phases.values())
+
+
+@dataclass
+class Frame_Statistics:
+    history: int = FRAME_HISTORY
+    _frames: deque[Frame] = field(init=False)
+    _phases: dict[str, float] = field(default_factory=dict)
+    _counts: Counter = field(default_factory=Counter)
+    _frame_start: float | None = None
+    _phase: str | None = None
+    _phase_start: float = 0
+
+    def __post_init__(self):
+        self._frames = deque(maxlen=self.history)
+
+    def begin_frame(self):
+        self._phases = dict.fromkeys(PHASES, 0.0)
+        self._counts = Counter()
+        self._frame_start = perf_counter()
+        self._phase = None
+
+    def switch_phase(self, phase: str | None):
+        # Time until the next switch goes to this phase, None stops the clock
+        now = perf_counter()
+        if self._phase is not None:
+            self._phases[self._phase] += now - self._phase_start
+        self._phase = phase
+        self._phase_start = now
+
+    def count(self, name: str, amount: int = 1):
+        self._counts[name] += amount
+
+    def end_frame(self) -> Frame | None:
+        if self._frame_start is None:
+            return None
+
+        self.switch_phase(None)
+        frame = Frame(self._phases, self._counts, perf_counter() - self._frame_start)
+        self._frames.append(frame)
+        self._frame_start = None
+        return frame
+
+    def get_frames(self) -> list[Frame]:
+        return list(self._frames)
+
+    def get_last_frame(self) -> Frame | None:
+        return self._frames[-1] if self._frames else None
+
+    def get_percentiles(
+        self, percentiles: tuple[float, ...] = PERCENTILES
+    ) -> dict[str, dict[float, float]]:
+        # Milliseconds of each phase, the total and the elapsed time at each
+        # percentile of the last frames
+        if not self._frames:
+            return dict()
+
+        times = {phase: [] for phase in PHASES + ["total", "elapsed"]}
+        for frame in self._frames:
+            for phase in PHASES:
+                times[phase].append(frame.phases[phase])
+            times["total"].append(frame.get_total())
+            times["elapsed"].append(frame.elapsed)
+
+        return {
+            phase: dict(
+                zip(percentiles, (percentile(values, percentiles) * 1000).tolist())
+            )
+            for phase, values in times.items()
+        }
+
+    def get_summary(self) -> str:
+        frame = self.get_last_frame()
+        if frame is None:
+            return "No frames"
+
+        total = self.get_percentiles()["total"]
+        phases = " ".join(
+            f"{phase} {seconds * 1000:.1f}" for phase, seconds in frame.phases.items()
+        )
+        counts = frame.counts
+        return "\n".join(
+            [
+                f"Frame {frame.get_total() * 1000:.1f} ms, "
+                + ", ".join(f"p{key} {value:.1f}" for key, value in total.items()),
+                f"{phases} ms",
+                f"{counts['drawables']} drawables: {counts['culled']} culled, "
+                f"{counts['accepted']} accepted, {counts['clipped']} clipped, "
+                f"{counts['rejected']} rejected",
+                f"{counts['vertexes']} vertexes, {counts['items_created']} items "
+                f"created, {counts['items_reused']} reused",
+            ]
+        )
@@ -1,9 +1,46 @@
-from dataclasses import dataclass
-from typing import Protocol, Self
+from dataclasses import dataclass, field
+from typing import Callable, Protocol, Self
 from types import SimpleNamespace
 from copy import deepcopy
-
-from numpy import double, dot
+from itertools import count
+from functools import lru_cache
+from math import floor, log2
+
+from numpy import (
+    double,
+    dot,
+    ndarray,
+    asarray,
+    array,
+    empty,
+    ones,
+    float64,
+    int8,
+    arange,
+    unique,
+    diff,
+    split,
+    cumsum,
+    searchsorted,
+    repeat,
+    full,
+    linspace,
+    column_stack,
+    ceil,
+    sqrt,
+    concatenate,
+    zeros,
+    hstack,
+    stack,
+    roll,
+    maximum,
+    minimum,
+    hypot,
+    where,
+    nonzero,
+    errstate,
+)
+from numpy.linalg import norm
 from enum import Enum
 
 
@@ -23,6 +60,31 @@ const.WINDOW_NDC_MIN_Y = -1
 const.WINDOW_NDC_MAX_X = 1
 const.WINDOW_NDC_MAX_Y = 1
 
+# Cohen Sutherland region code bits
+const.REGION_INSIDE = 0b0000
+const.REGION_LEFT = 0b0001
+const.REGION_RIGHT = 0b0010
+const.REGION_BOTTOM = 0b0100
+const.REGION_TOP = 0b1000
+
+# Upper bound of vertexes a single Bezier segment is tessellated into
+const.CURVE_MAX_SAMPLES = 4096
+
+# Wireframes and polylines with fewer vertexes are always drawn with all of them
+const.LEVEL_OF_DETAIL_MIN_VERTEXES = 32
+
+# The first frame of a progressive redraw allows this many times the error in
+# pixels of the final one
+const.REDRAW_COARSENESS = 8
+
+# Every geometry change gets a new version, so a cached copy of a drawable is
+# stale whenever its version differs from the drawable it was made from
+_geometry_versions = count()
+
+
+def new_geometry_version() -> int:
+    return next(_geometry_versions)
+
 
 @dataclass
 class Coordinates:
@@ -47,6 +109,10 @@ class Coordinates:
     def __eq__(self, __value: object) -> bool:
         return self.x == __value.x and self.y == __value.y
 
+    @classmethod
+    def from_array(cls, vertex: ndarray) -> "Coordinates":
+        return cls(float(vertex[0]), float(vertex[1]))
+
 
 @dataclass
 class Area2d:
@@ -63,14 +129,70 @@ class Area2d:
     def zoom(self, ammount: float):
         self.max = self.max.multiply_scalar(1 + ammount)
 
+    def contains(self, other: "Area2d") -> bool:
+        return (
+            other.min.x >= self.min.x
+            and other.max.x <= self.max.x
+            and other.min.y >= self.min.y
+            and other.max.y <= self.max.y
+        )
+
+    def intersects(self, other: "Area2d") -> bool:
+        return (
+            other.min.x <= self.max.x
+            and other.max.x >= self.min.x
+            and other.min.y <= self.max.y
+            and other.max.y >= self.min.y
+        )
+
+
+WINDOW_NDC = Area2d(
+    Coordinates(const.WINDOW_NDC_MIN_X, const.WINDOW_NDC_MIN_Y),
+    Coordinates(const.WINDOW_NDC_MAX_X, const.WINDOW_NDC_MAX_Y),
+)
+
+
+def calculate_bounding_box(vertexes: ndarray) -> Area2d:
+    min_x, min_y = vertexes.min(axis=0).tolist()
+    max_x, max_y = vertexes.max(axis=0).tolist()
+    return Area2d(Coordinates(min_x, min_y), Coordinates(max_x, max_y))
+
 
 class Drawer(Protocol):
+    # Drawables are given already mapped to the viewport
+    def insert_drawables(self, names: list[str]):
+        ...
+
+    def clear_drawables(self):
+        ...
+
     def draw_point(self, coordinates: Coordinates):
         ...
 
     def draw_line(self, endpoint1: Coordinates, endpoint2: Coordinates):
         ...
 
+    def draw_polyline(self, vertexes: ndarray, color: Color):
+        ...
+
+    def draw_polygon_outline(self, vertexes: ndarray, color: Color):
+        ...
+
+    def draw_wireframe_filled(self, vertexes: ndarray, color: Color):
+        ...
+
+    def begin_drawable(self, name: str):
+        ...
+
+    def end_frame(self):
+        ...
+
+    def after_idle(self, callback: Callable[[], None]):
+        ...
+
+    def after(self, milliseconds: int, callback: Callable[[], None]):
+        ...
+
 
 def transform(coordinates: Coordinates, matrix: list[list[int | double | float]]):
     p = (coordinates.x, coordinates.y, 1)
@@ -78,8 +200,37 @@ def transform(coordinates: Coordinates, matrix: list[list[int | double | float]]
     return Coordinates(new_p[0], new_p[1])
 
 
+def as_vertex_array(vertexes: ndarray | list[Coordinates]) -> ndarray:
+    if isinstance(vertexes, ndarray):
+        return asarray(vertexes, dtype=float64).reshape(-1, 2)
+
+    vertex_array = empty((len(vertexes), 2), dtype=float64)
+    for i, vertex in enumerate(vertexes):
+        vertex_array[i] = vertex.x, vertex.y
+    return vertex_array
+
+
+def as_coordinates(vertexes: ndarray) -> list[Coordinates]:
+    return [Coordinates(x, y) for x, y in vertexes.tolist()]
+
+
+def transform_vertexes(
+    vertexes: ndarray, matrix: list[list[int | double | float]]
+) -> ndarray:
+    # Same as transform() for every row, the homogeneous column is implicit
+    matrix = asarray(matrix, dtype=float64)
+    return vertexes @ matrix[:2, :2] + matrix[2, :2]
+
+
 class Drawable(Protocol):
     color: Color
+    version: int
+
+    def get_bounding_box(self) -> Area2d:
+        ...
+
+    def set_bounding_box(self, bounding_box: Area2d):
+        ...
 
     def draw(self, drawer: Drawer):
         ...
@@ -93,9 +244,89 @@ class Drawable(Protocol):
     def clip_NDC(self, default: bool = True):
         ...
 
+    def get_vertexes(self) -> ndarray:
+        ...
+
+    def with_vertexes(self, vertexes: ndarray) -> Self:
+        ...
+
+
+def transform_drawables(
+    drawables: list[Drawable], matrix: list[list[int | double | float]]
+) -> list[Drawable]:
+    # Gathers the vertexes of every drawable in a single homogeneous array,
+    # transforms them with one matrix multiplication and gives each new
+    # drawable a view of its own rows
+    if len(drawables) == 0:
+        return list()
+
+    all_vertexes = [drawable.get_vertexes() for drawable in drawables]
+    homogeneous = empty((sum(len(vertexes) for vertexes in all_vertexes), 3))
+    concatenate(all_vertexes, out=homogeneous[:, :2])
+    homogeneous[:, 2] = 1
+
+    transformed = homogeneous @ asarray(matrix, dtype=float64)
+
+    new_drawables = list()
+    start = 0
+    for drawable, vertexes in zip(drawables, all_vertexes):
+        end = start + len(vertexes)
+        new_drawables.append(drawable.with_vertexes(transformed[start:end, :2]))
+        start = end
+
+    return new_drawables
+
+
+@dataclass(eq=False)
+class Cached_Geometry:
+    # Version and bounding box of the geometry of a drawable, both have to be
+    # renewed through geometry_changed whenever its vertexes change
+    version: int = field(
+        default_factory=new_geometry_version, kw_only=True, compare=False, repr=False
+    )
+    _bounding_box: Area2d | None = field(
+        default=None, init=False, compare=False, repr=False
+    )
+
+    def geometry_changed(self):
+        self.version = new_geometry_version()
+        self._bounding_box = None
+
+    def get_bounding_box(self) -> Area2d:
+        if self._bounding_box is None:
+            self._bounding_box = calculate_bounding_box(self.get_vertexes())
+        return self._bounding_box
+
+    def set_bounding_box(self, bounding_box: Area2d):
+        # For a box known beforehand, so the vertexes are not read for it
+        self._bounding_box = bounding_box
+
+
+@dataclass(eq=False)
+class Simplified_Geometry(Cached_Geometry):
+    # Geometry also kept simplified by tolerance level, see get_level_of_detail
+    _levels_of_detail: dict[int, ndarray] = field(
+        default_factory=dict, init=False, compare=False, repr=False
+    )
+
+    def geometry_changed(self):
+        super().geometry_changed()
+        self._levels_of_detail.clear()
+
+    def simplify(self, tolerance: float) -> ndarray:
+        ...
+
+    def get_level_of_detail(self, tolerance: float) -> ndarray:
+        # Tolerances are rounded down to a power of two, so the simplified
+        # vertexes are reused while zooming
+        level = floor(log2(tolerance))
+        if level not in self._levels_of_detail:
+            self._levels_of_detail[level] = self.simplify(2.0**level)
+        return self._levels_of_detail[level]
+
 
 @dataclass
-class Point:
+class Point(Cached_Geometry):
     coordinates: Coordinates
     color: Color = Color.BLACK
 
@@ -104,11 +335,19 @@ class Point:
 
     def transform(self, matrix: list[list[int | double | float]]):
         self.coordinates = transform(self.coordinates, matrix)
+        self.geometry_changed()
 
     def calculate_center(self):
         center = self.coordinates
         return center
 
+    def get_vertexes(self) -> ndarray:
+        return array([[self.coordinates.x, self.coordinates.y]], dtype=float64)
+
+    def with_vertexes(self, vertexes: ndarray) -> Self:
+        ((x, y),) = vertexes.tolist()
+        return Point(Coordinates(x, y), self.color)
+
     def clip_NDC(self, default: bool = True) -> list[Self] | None:
         if (
             self.coordinates.x >= const.WINDOW_NDC_MIN_X
@@ -122,11 +361,11 @@ class Point:
 
 
 def clip_point_Cohen_Sutherland(
-    endpoint: Coordinates, region_code: str, angular_coeficient: int
+    endpoint: Coordinates, region_code: int, angular_coeficient: int
 ) -> Coordinates:
     new_endpoint = None
 
-    if region_code[0] == "1":  # Over the top
+    if region_code & const.REGION_TOP:
         if angular_coeficient == 0:
             new_x = endpoint.x
         else:
@@ -135,7 +374,7 @@ def clip_point_Cohen_Sutherland(
             )
         new_endpoint = Coordinates(new_x, const.WINDOW_NDC_MAX_Y)
 
-    elif region_code[1] == "1":  # Over the bottom
+    elif region_code & const.REGION_BOTTOM:
         if angular_coeficient == 0:
             new_x = endpoint.x
         else:
@@ -151,12 +390,12 @@ def clip_point_Cohen_Sutherland(
     ):
         return new_endpoint
 
-    if region_code[2] == "1":  # Over the right
+    if region_code & const.REGION_RIGHT:
         new_endpoint = Coordinates(
             const.WINDOW_NDC_MAX_X,
             angular_coeficient * (const.WINDOW_NDC_MAX_X - endpoint.x) + endpoint.y,
         )
-    elif region_code[3] == "1":  # Over the left
+    elif region_code & const.REGION_LEFT:
         new_endpoint = Coordinates(
             const.WINDOW_NDC_MIN_X,
             angular_coeficient * (const.WINDOW_NDC_MIN_X - endpoint.x) + endpoint.y,
@@ -171,8 +410,180 @@ def clip_point_Cohen_Sutherland(
     return None
 
 
+def get_region_codes(x: ndarray, y: ndarray) -> ndarray:
+    region_codes = (
+        (y > const.WINDOW_NDC_MAX_Y) * const.REGION_TOP
+        | (y < const.WINDOW_NDC_MIN_Y) * const.REGION_BOTTOM
+        | (x > const.WINDOW_NDC_MAX_X) * const.REGION_RIGHT
+        | (x < const.WINDOW_NDC_MIN_X) * const.REGION_LEFT
+    )
+    return region_codes.astype(int8)
+
+
+def clip_segments_Cohen_Sutherland(segments: ndarray) -> tuple[ndarray, ndarray]:
+    # segments: (N, 4) rows of x1, y1, x2, y2
+    # Returns the clipped surviving segments and the mask of which survived
+    segments = array(segments, dtype=float64).reshape(-1, 4)
+    x1, y1, x2, y2 = segments.T
+    region_code1 = get_region_codes(x1, y1)
+    region_code2 = get_region_codes(x2, y2)
+
+    keep = ones(len(segments), dtype=bool)
+
+    # Each endpoint is moved at most twice, once per axis
+    for _ in range(4):
+        rejected = (region_code1 & region_code2) != const.REGION_INSIDE
+        keep &= ~rejected
+        active = nonzero(keep & ((region_code1 | region_code2) != 0))[0]
+        if len(active) == 0:
+            break
+
+        first = region_code1[active] != const.REGION_INSIDE
+        region_code = where(first, region_code1[active], region_code2[active])
+
+        ax, ay = x1[active], y1[active]
+        delta_x = x2[active] - ax
+        delta_y = y2[active] - ay
+
+        top = (region_code & const.REGION_TOP) != 0
+        bottom = ~top & ((region_code & const.REGION_BOTTOM) != 0)
+        right = ~top & ~bottom & ((region_code & const.REGION_RIGHT) != 0)
+
+        border_y = where(top, const.WINDOW_NDC_MAX_Y, const.WINDOW_NDC_MIN_Y)
+        border_x = where(right, const.WINDOW_NDC_MAX_X, const.WINDOW_NDC_MIN_X)
+        vertical = top | bottom
+
+        with errstate(divide="ignore", invalid="ignore"):
+            new_x = where(vertical, ax + delta_x * (border_y - ay) / delta_y, border_x)
+            new_y = where(vertical, border_y, ay + delta_y * (border_x - ax) / delta_x)
+
+        moved1, moved2 = active[first], active[~first]
+        x1[moved1], y1[moved1] = new_x[first], new_y[first]
+        x2[moved2], y2[moved2] = new_x[~first], new_y[~first]
+        region_code1[moved1] = get_region_codes(x1[moved1], y1[moved1])
+        region_code2[moved2] = get_region_codes(x2[moved2], y2[moved2])
+
+    keep &= (region_code1 | region_code2) == const.REGION_INSIDE
+
+    return segments[keep], keep
+
+
+def clip_segments_Liang_Barsky(segments: ndarray) -> tuple[ndarray, ndarray]:
+    # segments: (N, 4) rows of x1, y1, x2, y2
+    # Returns the clipped surviving segments and the mask of which survived
+    segments = asarray(segments, dtype=float64).reshape(-1, 4)
+    x1, y1, x2, y2 = segments.T
+    delta_x = x2 - x1
+    delta_y = y2 - y1
+
+    zeta1 = zeros(len(segments))
+    zeta2 = ones(len(segments))
+    keep = ones(len(segments), dtype=bool)
+
+    for p, q in (
+        (-delta_x, x1 - const.WINDOW_NDC_MIN_X),
+        (delta_x, const.WINDOW_NDC_MAX_X - x1),
+        (-delta_y, y1 - const.WINDOW_NDC_MIN_Y),
+        (delta_y, const.WINDOW_NDC_MAX_Y - y1),
+    ):
+        with errstate(divide="ignore", invalid="ignore"):
+            r = q / p
+        maximum(zeta1, r, out=zeta1, where=p < 0)
+        minimum(zeta2, r, out=zeta2, where=p > 0)
+        keep &= (p != 0) | (q >= 0)
+
+    keep &= zeta1 <= zeta2
+
+    zeta1 = zeta1[keep, None]
+    zeta2 = zeta2[keep, None]
+    endpoint1 = segments[keep, :2]
+    endpoint2 = segments[keep, 2:]
+    delta = endpoint2 - endpoint1
+
+    segments_clipped = hstack(
+        (
+            where(zeta1 > 0, endpoint1 + delta * zeta1, endpoint1),
+            where(zeta2 < 1, endpoint1 + delta * zeta2, endpoint2),
+        )
+    )
+
+    return segments_clipped, keep
+
+
+def clip_segments(segments: ndarray, default: bool = True) -> tuple[ndarray, ndarray]:
+    if default:
+        return clip_segments_Cohen_Sutherland(segments)
+
+    return clip_segments_Liang_Barsky(segments)
+
+
+def clip_polyline(
+    vertexes: ndarray, default: bool = True, inside_edges: ndarray | None = None
+) -> list[ndarray]:
+    # Clips an open polyline into the runs of it that are inside the window,
+    # a run is broken where the polyline leaves the window. Edges already
+    # known to be inside the window are not clipped
+    if len(vertexes) < 2:
+        return list()
+
+    if inside_edges is not None and inside_edges.all():
+        return [vertexes]
+
+    segments = hstack((vertexes[:-1], vertexes[1:]))
+
+    if inside_edges is None:
+        segments_clipped, keep = clip_segments(segments, default)
+    else:
+        partial = ~inside_edges
+        partial_clipped, partial_keep = clip_segments(segments[partial], default)
+        keep = inside_edges.copy()
+        keep[partial] = partial_keep
+        segments_clipped = segments.copy()
+        segments_clipped[nonzero(partial)[0][partial_keep]] = partial_clipped
+        segments_clipped = segments_clipped[keep]
+
+    indexes = nonzero(keep)[0]
+
+    if len(indexes) == 0:
+        return list()
+
+    start_clipped = (segments_clipped[:, :2] != segments[indexes, :2]).any(axis=1)
+    end_clipped = (segments_clipped[:, 2:] != segments[indexes, 2:]).any(axis=1)
+    breaks = (diff(indexes) != 1) | end_clipped[:-1] | start_clipped[1:]
+
+    runs = list()
+    for run in split(segments_clipped, nonzero(breaks)[0] + 1):
+        runs.append(concatenate((run[:1, :2], run[:, 2:])))
+
+    return runs
+
+
+def clip_lines(lines: list["Line"], default: bool = True) -> list["Line | None"]:
+    # Clips every line at once, None marks the ones out of the window
+    segments = array(
+        [
+            (line.endpoint1.x, line.endpoint1.y, line.endpoint2.x, line.endpoint2.y)
+            for line in lines
+        ],
+        dtype=float64,
+    )
+    segments_clipped, keep = clip_segments(segments, default)
+    segments_clipped = iter(segments_clipped.tolist())
+
+    lines_clipped = list()
+    for line, kept in zip(lines, keep.tolist()):
+        if not kept:
+            lines_clipped.append(None)
+            continue
+
+        x1, y1, x2, y2 = next(segments_clipped)
+        lines_clipped.append(Line(Coordinates(x1, y1), Coordinates(x2, y2), line.color))
+
+    return lines_clipped
+
+
 @dataclass
-class Line:
+class Line(Cached_Geometry):
     endpoint1: Coordinates
     endpoint2: Coordinates
     color: Color = Color.BLACK
@@ -183,6 +594,7 @@ class Line:
     def transform(self, matrix: list[list[int | double | float]]):
         self.endpoint1 = transform(self.endpoint1, matrix)
         self.endpoint2 = transform(self.endpoint2, matrix)
+        self.geometry_changed()
 
     def calculate_center(self):
         x_center = (self.endpoint1.x + self.endpoint2.x) / 2
@@ -190,30 +602,31 @@ class Line:
         center = Coordinates(x_center, y_center)
         return center
 
-    def get_region_code(self, endpoint: Coordinates) -> str:  # binary number
-        # Over the top
-        if endpoint.y > const.WINDOW_NDC_MAX_Y:
-            region_code = "1"
-        else:
-            region_code = "0"
+    def get_vertexes(self) -> ndarray:
+        return array(
+            [
+                [self.endpoint1.x, self.endpoint1.y],
+                [self.endpoint2.x, self.endpoint2.y],
+            ],
+            dtype=float64,
+        )
 
-        # Over the bottom
-        if endpoint.y < const.WINDOW_NDC_MIN_Y:
-            region_code = region_code + "1"
-        else:
-            region_code = region_code + "0"
+    def with_vertexes(self, vertexes: ndarray) -> Self:
+        (x1, y1), (x2, y2) = vertexes.tolist()
+        return Line(Coordinates(x1, y1), Coordinates(x2, y2), self.color)
 
-        # Over the right
-        if endpoint.x > const.WINDOW_NDC_MAX_X:
-            region_code = region_code + "1"
-        else:
-            region_code = region_code + "0"
+    def get_region_code(self, endpoint: Coordinates) -> int:
+        region_code = const.REGION_INSIDE
 
-        # Over the left
-        if endpoint.x < const.WINDOW_NDC_MIN_X:
-            region_code = region_code + "1"
-        else:
-            region_code = region_code + "0"
+        if endpoint.y > const.WINDOW_NDC_MAX_Y:
+            region_code |= const.REGION_TOP
+        elif endpoint.y < const.WINDOW_NDC_MIN_Y:
+            region_code |= const.REGION_BOTTOM
+
+        if endpoint.x > const.WINDOW_NDC_MAX_X:
+            region_code |= const.REGION_RIGHT
+        elif endpoint.x < const.WINDOW_NDC_MIN_X:
+            region_code |= const.REGION_LEFT
 
         return region_code
 
@@ -221,10 +634,10 @@ class Line:
         region_code1 = self.get_region_code(self.endpoint1)
         region_code2 = self.get_region_code(self.endpoint2)
 
-        if int(region_code1, 2) + int(region_code2, 2) == 0:
-            return deepcopy(self)
+        if region_code1 | region_code2 == const.REGION_INSIDE:
+            return self
 
-        if int(region_code1, 2) & int(region_code2, 2) != 0:
+        if region_code1 & region_code2 != const.REGION_INSIDE:
             return None
 
         delta_x = self.endpoint2.x - self.endpoint1.x
@@ -234,22 +647,22 @@ class Line:
         else:
             angular_coeficient = (self.endpoint2.y - self.endpoint1.y) / delta_x
 
-        if int(region_code1) != 0:
+        if region_code1 != const.REGION_INSIDE:
             endpoint1 = clip_point_Cohen_Sutherland(
                 self.endpoint1, region_code1, angular_coeficient
             )
         else:
-            endpoint1 = deepcopy(self.endpoint1)
+            endpoint1 = self.endpoint1
 
         if not endpoint1:
             return None
 
-        if int(region_code2) != 0:
+        if region_code2 != const.REGION_INSIDE:
             endpoint2 = clip_point_Cohen_Sutherland(
                 self.endpoint2, region_code2, angular_coeficient
             )
         else:
-            endpoint2 = deepcopy(self.endpoint2)
+            endpoint2 = self.endpoint2
 
         if not endpoint2:
             return None
@@ -320,56 +733,180 @@ class Line:
         return None
 
 
-@dataclass
-class Wireframe:
-    vertexes: list[Coordinates]
+def clip_polygon_border(
+    vertexes: ndarray, axis: int, border: int | float, inside_below: bool
+) -> ndarray:
+    # One Sutherland Hodgman pass, every edge is handled at once
+    following = roll(vertexes, -1, axis=0)
+    current_values = vertexes[:, axis]
+    following_values = following[:, axis]
+
+    if inside_below:
+        current_inside = current_values <= border
+        following_inside = following_values <= border
+    else:
+        current_inside = current_values >= border
+        following_inside = following_values >= border
+
+    crossing = current_inside != following_inside
+
+    intersections = empty((len(vertexes), 2))
+    start = vertexes[crossing]
+    delta = following[crossing] - start
+    t = (border - start[:, axis]) / delta[:, axis]
+    intersections[crossing] = start + delta * t[:, None]
+    intersections[crossing, axis] = border
+
+    # Each edge outputs its intersection (if crossing) and then its following
+    # vertex (if inside), in that order
+    output = stack((intersections, following), axis=1)
+    output_mask = stack((crossing, following_inside), axis=1)
+
+    return output[output_mask]
+
+
+def clip_polygon_Sutherland_Hodgman(vertexes: ndarray) -> ndarray:
+    for axis, border, inside_below in (
+        (0, const.WINDOW_NDC_MAX_X, True),
+        (1, const.WINDOW_NDC_MIN_Y, False),
+        (0, const.WINDOW_NDC_MIN_X, False),
+        (1, const.WINDOW_NDC_MAX_Y, True),
+    ):
+        if len(vertexes) == 0:
+            break
+        vertexes = clip_polygon_border(vertexes, axis, border, inside_below)
+
+    return vertexes
+
+
+def simplify_polyline(vertexes: ndarray, tolerance: float) -> ndarray:
+    # Douglas Peucker, keeps both endpoints
+    keep = zeros(len(vertexes), dtype=bool)
+    keep[0] = keep[-1] = True
+
+    ranges = [(0, len(vertexes) - 1)]
+    while ranges:
+        first, last = ranges.pop()
+        if last - first < 2:
+            continue
+
+        start = vertexes[first]
+        direction = vertexes[last] - start
+        relative = vertexes[first + 1 : last] - start
+        length = hypot(*direction)
+        if length == 0:
+            distances = norm(relative, axis=1)
+        else:
+            distances = (
+                abs(direction[0] * relative[:, 1] - direction[1] * relative[:, 0])
+                / length
+            )
+
+        farthest = int(distances.argmax())
+        if distances[farthest] > tolerance:
+            farthest += first + 1
+            keep[farthest] = True
+            ranges.append((first, farthest))
+            ranges.append((farthest, last))
+
+    return vertexes[keep]
+
+
+def simplify_polygon(vertexes: ndarray, tolerance: float) -> ndarray:
+    # The closed outline is split in two polylines at the vertex farthest
+    # from the first one
+    farthest = int(norm(vertexes - vertexes[0], axis=1).argmax())
+    if farthest == 0:
+        return vertexes
+
+    closed = concatenate((vertexes, vertexes[:1]))
+    first_half = simplify_polyline(closed[: farthest + 1], tolerance)
+    second_half = simplify_polyline(closed[farthest:], tolerance)
+    simplified = concatenate((first_half, second_half[1:-1]))
+
+    if len(simplified) < 3:
+        # Thinner than the tolerance, kept as the triangle of its endpoints
+        # and the vertex farthest from the line between them
+        direction = vertexes[farthest] - vertexes[0]
+        relative = vertexes - vertexes[0]
+        distances = abs(direction[0] * relative[:, 1] - direction[1] * relative[:, 0])
+        return vertexes[sorted((0, farthest, int(distances.argmax())))]
+
+    return simplified
+
+
+@dataclass(eq=False)
+class Wireframe(Simplified_Geometry):
+    vertexes: ndarray
     color: Color = Color.BLACK
     filled: bool = False
 
+    def __post_init__(self):
+        self.vertexes = as_vertex_array(self.vertexes)
+
     def draw(self, drawer: Drawer):
         if len(self.vertexes) > 2:
             if self.filled:
                 drawer.draw_wireframe_filled(self.vertexes, self.color)
             else:
-                for i in range(len(self.vertexes) - 1):
-                    drawer.draw_line(self.vertexes[i], self.vertexes[i + 1], self.color)
-                drawer.draw_line(self.vertexes[-1], self.vertexes[0], self.color)
+                drawer.draw_polygon_outline(self.vertexes, self.color)
 
     def transform(self, matrix: list[list[int | double | float]]):
-        new_vertexes = list()
-        for vertex in self.vertexes:
-            new_vertexes.append(transform(vertex, matrix))
-        self.vertexes = new_vertexes
+        self.vertexes = transform_vertexes(self.vertexes, matrix)
+        self.geometry_changed()
+
+    def simplify(self, tolerance: float) -> ndarray:
+        return simplify_polygon(self.vertexes, tolerance)
 
     def calculate_center(self):
-        center_x = 0
-        center_y = 0
-        for vertex in self.vertexes:
-            center_x += vertex.x
-            center_y += vertex.y
-        center_x = center_x / len(self.vertexes)
-        center_y = center_y / len(self.vertexes)
+        center_x, center_y = self.vertexes.mean(axis=0)
         center = Coordinates(center_x, center_y)
         return center
 
+    def get_vertexes(self) -> ndarray:
+        return self.vertexes
+
+    def with_vertexes(self, vertexes: ndarray) -> Self:
+        return Wireframe(vertexes, self.color, self.filled)
+
+    def get_edges(self) -> ndarray:
+        # (N, 4) rows of x1, y1, x2, y2, the last edge closes the wireframe
+        return hstack((self.vertexes, roll(self.vertexes, -1, axis=0)))
+
+    def clip_edges(self, edges: ndarray, default: bool) -> list[Line | None]:
+        edges_clipped, keep = clip_segments(edges, default)
+        edges_clipped = iter(edges_clipped.tolist())
+
+        new_lines = list()
+        for kept in keep.tolist():
+            if kept:
+                x1, y1, x2, y2 = next(edges_clipped)
+                new_lines.append(
+                    Line(Coordinates(x1, y1), Coordinates(x2, y2), self.color)
+                )
+            else:
+                new_lines.append(None)
+
+        return new_lines
+
     def check_clockwise_and_valid_vertexes(
         self, default: bool
     ) -> tuple[bool, list[tuple[Coordinates, bool, bool]]]:
-        clockwise_sum = 0
+        vertexes = as_coordinates(self.vertexes)
         if (
-            self.vertexes[0].x >= const.WINDOW_NDC_MIN_X
-            and self.vertexes[0].x <= const.WINDOW_NDC_MAX_X
-            and self.vertexes[0].y >= const.WINDOW_NDC_MIN_Y
-            and self.vertexes[0].y <= const.WINDOW_NDC_MAX_Y
+            vertexes[0].x >= const.WINDOW_NDC_MIN_X
+            and vertexes[0].x <= const.WINDOW_NDC_MAX_X
+            and vertexes[0].y >= const.WINDOW_NDC_MIN_Y
+            and vertexes[0].y <= const.WINDOW_NDC_MAX_Y
         ):
-            new_vertexes = [self.vertexes[0]]
+            new_vertexes = [vertexes[0]]
             if (
-                self.vertexes[0].x == const.WINDOW_NDC_MIN_X
-                or self.vertexes[0].x == const.WINDOW_NDC_MAX_X
-                or self.vertexes[0].y == const.WINDOW_NDC_MIN_Y
-                or self.vertexes[0].y == const.WINDOW_NDC_MAX_Y
+                vertexes[0].x == const.WINDOW_NDC_MIN_X
+                or vertexes[0].x == const.WINDOW_NDC_MAX_X
+                or vertexes[0].y == const.WINDOW_NDC_MIN_Y
+                or vertexes[0].y == const.WINDOW_NDC_MAX_Y
             ):
-                border_vertexes = [(self.vertexes[0], 0)]
+                border_vertexes = [(vertexes[0], 0)]
             else:
                 border_vertexes = list()
         else:
@@ -379,25 +916,27 @@ class Wireframe:
         inward_vertexes = set()
         outward_vertexes = set()
 
-        for vertex1, vertex2 in zip(
-            self.vertexes, self.vertexes[1:] + [self.vertexes[0]]
+        edges = self.get_edges()
+
+        # clockwise_sum += (vertex2.x - vertex1.x) * (vertex2.y - vertex1.y)
+        # top       = +
+        # right     = +
+        # bottom    = -
+        # left      = -
+
+        # top and left      = -
+        # top and right     = +
+        # bottom and left   = +
+        # bottom and right  = -
+
+        clockwise_sum = float(
+            ((edges[:, 2] - edges[:, 0]) * (edges[:, 3] - edges[:, 1])).sum()
+        )
+
+        for vertex1, vertex2, new_line in zip(
+            vertexes, vertexes[1:] + [vertexes[0]], self.clip_edges(edges, default)
         ):
-            # clockwise_sum += (vertex2.x - vertex1.x) * (vertex2.y - vertex1.y)
-            # top       = +
-            # right     = +
-            # bottom    = -
-            # left      = -
-
-            # top and left      = -
-            # top and right     = +
-            # bottom and left   = +
-            # bottom and right  = -
-
-            clockwise_sum += (vertex2.x - vertex1.x) * (vertex2.y - vertex1.y)
-            new_line = Line(vertex1, vertex2, self.color).clip_NDC(default)
             if new_line:
-                new_line = new_line[0]
-
                 if vertex1 != new_line.endpoint1:
                     if new_line.endpoint1.x >= 0.998:
                         new_line.endpoint1.x = 1
@@ -428,10 +967,10 @@ class Wireframe:
                     outward_vertexes.add(len(new_vertexes))
                 else:
                     if (
-                        self.vertexes[0].x == const.WINDOW_NDC_MIN_X
-                        or self.vertexes[0].x == const.WINDOW_NDC_MAX_X
-                        or self.vertexes[0].y == const.WINDOW_NDC_MIN_Y
-                        or self.vertexes[0].y == const.WINDOW_NDC_MAX_Y
+                        vertexes[0].x == const.WINDOW_NDC_MIN_X
+                        or vertexes[0].x == const.WINDOW_NDC_MAX_X
+                        or vertexes[0].y == const.WINDOW_NDC_MIN_Y
+                        or vertexes[0].y == const.WINDOW_NDC_MAX_Y
                     ):
                         border_vertexes.append((new_line.endpoint2, len(new_vertexes)))
                 new_vertexes.append(new_line.endpoint2)
@@ -625,7 +1164,23 @@ class Wireframe:
         wireframes_list.append(wireframe)
         coordinates.clear()
 
-    def clip_NDC(self, default: bool = True) -> list[list[Self]] | None:
+    def clip_NDC(
+        self, default: bool = True, polygon_default: bool = True
+    ) -> list[Self] | None:
+        if polygon_default:
+            return self.clip_Weiler_Atherton(default)
+
+        return self.clip_Sutherland_Hodgman()
+
+    def clip_Sutherland_Hodgman(self) -> list[Self] | None:
+        vertexes = clip_polygon_Sutherland_Hodgman(self.vertexes)
+
+        if len(vertexes) < 3:
+            return None
+
+        return [Wireframe(vertexes, self.color, self.filled)]
+
+    def clip_Weiler_Atherton(self, default: bool = True) -> list[Self] | None:
         (
             clockwise,
             new_vertexes,
@@ -678,14 +1233,56 @@ class Wireframe:
 
         return new_wireframes
 
-@dataclass
+
+@dataclass(eq=False)
+class Polyline(Simplified_Geometry):
+    # Open sequence of connected lines
+    vertexes: ndarray
+    color: Color = Color.BLACK
+
+    def __post_init__(self):
+        self.vertexes = as_vertex_array(self.vertexes)
+
+    def draw(self, drawer: Drawer):
+        if len(self.vertexes) > 1:
+            drawer.draw_polyline(self.vertexes, self.color)
+
+    def transform(self, matrix: list[list[int | double | float]]):
+        self.vertexes = transform_vertexes(self.vertexes, matrix)
+        self.geometry_changed()
+
+    def simplify(self, tolerance: float) -> ndarray:
+        return simplify_polyline(self.vertexes, tolerance)
+
+    def calculate_center(self):
+        center_x, center_y = self.vertexes.mean(axis=0)
+        center = Coordinates(center_x, center_y)
+        return center
+
+    def get_vertexes(self) -> ndarray:
+        return self.vertexes
+
+    def with_vertexes(self, vertexes: ndarray) -> Self:
+        return Polyline(vertexes, self.color)
+
+    def clip_NDC(self, default: bool = True) -> list["Curve2D_clipped"]:
+        return [
+            Curve2D_clipped(run, self.color)
+            for run in clip_polyline(self.vertexes, default)
+        ]
+
+
+@dataclass(eq=False)
 class Curve2D_clipped:
-    vertexes: list[Coordinates]
+    vertexes: ndarray
     color: Color = Color.BLACK
 
+    def __post_init__(self):
+        self.vertexes = as_vertex_array(self.vertexes)
+
     def draw(self, drawer: Drawer):
-        for i in range(len(self.vertexes) - 1):
-            drawer.draw_line(self.vertexes[i], self.vertexes[i + 1], self.color)
+        if len(self.vertexes) > 1:
+            drawer.draw_polyline(self.vertexes, self.color)
 
     # This object is already transformed
     def transform(self, matrix: list[list[int | double | float]]):
@@ -695,72 +1292,204 @@ class Curve2D_clipped:
     def calculate_center(self):
         ...
 
+    def get_vertexes(self) -> ndarray:
+        return self.vertexes
+
+    def with_vertexes(self, vertexes: ndarray) -> Self:
+        return Curve2D_clipped(vertexes, self.color)
+
     # This object is already clipped
     def clip_NDC(self, default: bool = True):
         ...
 
-@dataclass
-class Curve2D:
-    vertexes: list[Coordinates]
+
+BEZIER_TRANSFORMATION = array(
+    (
+        (-1, 3, -3, 1),
+        (3, -6, 3, 0),
+        (-3, 3, 0, 0),
+        (1, 0, 0, 0),
+    ),
+    dtype=float64,
+)
+
+
+@lru_cache(maxsize=256)
+def get_bezier_basis(samples: int) -> ndarray:
+    # (samples, 4) matrix that evaluates a segment's geometry matrix at
+    # t = 1/samples, 2/samples, ..., 1 (t = 0 belongs to the previous segment)
+    t = linspace(0, 1, samples + 1)[1:]
+    t_powers = column_stack((t**3, t**2, t, ones(samples)))
+    basis = t_powers @ BEZIER_TRANSFORMATION
+    basis.flags.writeable = False
+    return basis
+
+
+def evaluate_bezier_segments(segments: ndarray, samples_count: ndarray) -> ndarray:
+    # Evaluates every (4, 2) segment with its own amount of samples and returns
+    # them all in segment order, segments with the same amount of samples are
+    # evaluated together in a single matrix multiplication
+    samples_values = unique(samples_count).tolist()
+    if len(samples_values) == 1:
+        samples = samples_values[0]
+        return (get_bezier_basis(samples) @ segments).reshape(-1, 2)
+
+    ends = samples_count.cumsum()
+    vertexes = empty((ends[-1] if len(ends) else 0, 2))
+
+    for samples in samples_values:
+        indexes = nonzero(samples_count == samples)[0]
+        positions = (ends[indexes] - samples)[:, None] + arange(samples)
+        vertexes[positions] = get_bezier_basis(samples) @ segments[indexes]
+
+    return vertexes
+
+
+def get_segments_visibility(segments: ndarray) -> tuple[ndarray, ndarray]:
+    # A Bezier segment is inside the convex hull of its control points, so
+    # their bounding box tells which segments are surely outside the window
+    # and which are surely inside it
+    minimums = segments.min(axis=1)
+    maximums = segments.max(axis=1)
+
+    outside = (
+        (maximums[:, 0] < const.WINDOW_NDC_MIN_X)
+        | (minimums[:, 0] > const.WINDOW_NDC_MAX_X)
+        | (maximums[:, 1] < const.WINDOW_NDC_MIN_Y)
+        | (minimums[:, 1] > const.WINDOW_NDC_MAX_Y)
+    )
+    inside = (
+        (minimums[:, 0] >= const.WINDOW_NDC_MIN_X)
+        & (maximums[:, 0] <= const.WINDOW_NDC_MAX_X)
+        & (minimums[:, 1] >= const.WINDOW_NDC_MIN_Y)
+        & (maximums[:, 1] <= const.WINDOW_NDC_MAX_Y)
+    )
+
+    return outside, inside
+
+
+def tessellate_curves(
+    curves: list["Curve2D"], tolerance: float | None = None
+) -> list[list[tuple[ndarray, ndarray]]]:
+    # Tessellates the segments of every curve that can be seen in the window,
+    # all of them in the same evaluation. Each curve gets its visible pieces:
+    # the vertexes of consecutive visible segments and which of the edges
+    # between them are surely inside the window
+    all_segments = [curve.get_segments() for curve in curves]
+    segments_count = [len(segments) for segments in all_segments]
+    if sum(segments_count) == 0:
+        return [list() for _ in curves]
+
+    segments = concatenate(all_segments)
+    samples_count = concatenate(
+        [
+            curve.get_samples_count(segments, tolerance)
+            for curve, segments in zip(curves, all_segments)
+        ]
+    )
+    outside, inside = get_segments_visibility(segments)
+
+    visible = nonzero(~outside)[0]
+    visible_samples_count = samples_count[visible]
+    vertexes = evaluate_bezier_segments(segments[visible], visible_samples_count)
+    ends = visible_samples_count.cumsum()
+
+    curves_pieces = list()
+    curve_ends = cumsum(segments_count)
+    for curve_start, curve_end in zip(curve_ends - segments_count, curve_ends):
+        first = searchsorted(visible, curve_start)
+        last = searchsorted(visible, curve_end)
+        curve_visible = arange(first, last)
+        groups = split(curve_visible, nonzero(diff(visible[first:last]) != 1)[0] + 1)
+
+        pieces = list()
+        for group in groups:
+            if len(group) == 0:
+                continue
+
+            start = ends[group[0]] - visible_samples_count[group[0]]
+            end = ends[group[-1]]
+            piece_vertexes = concatenate(
+                (segments[visible[group[0]], :1], vertexes[start:end])
+            )
+            inside_edges = repeat(inside[visible[group]], visible_samples_count[group])
+            pieces.append((piece_vertexes, inside_edges))
+
+        curves_pieces.append(pieces)
+
+    return curves_pieces
+
+
+@dataclass(eq=False)
+class Curve2D(Cached_Geometry):
+    vertexes: ndarray
     color: Color = Color.BLACK
     step: float = 0.001
 
+    def __post_init__(self):
+        self.vertexes = as_vertex_array(self.vertexes)
+
     # This object is only draw after clipped
     def draw(self, drawer: Drawer):
         ...
 
     def transform(self, matrix: list[list[int | double | float]]):
-        new_vertexes = list()
-        for vertex in self.vertexes:
-            new_vertexes.append(transform(vertex, matrix))
-        self.vertexes = new_vertexes
+        self.vertexes = transform_vertexes(self.vertexes, matrix)
+        self.geometry_changed()
 
     # This object does not support transformation
     def calculate_center(self):
         ...
 
-    def clip_NDC(self, default: bool = True) -> list[Curve2D_clipped] | None:
-        bezier_transformation = (
-            (-1, 3, -3, 1), 
-            (3, -6, 3, 0), 
-            (-3, 3, 0, 0), 
-            (1, 0, 0, 0)
-            )
-
-        initial_vertex = 0
-        curves_vertexes = list()
-        while(initial_vertex + 3 < len(self.vertexes)):
-            final_vertex = initial_vertex + 4
-
-            geometry_matrix = list()
-            for vertex in self.vertexes[initial_vertex:final_vertex]:
-                geometry_matrix.append([vertex.x, vertex.y])
-
-            curve_matrix = dot(bezier_transformation, geometry_matrix)
-
-            curve_vertexes = list()
-            t = 0
-            while t <= 1:
-                x, y = dot((t**3, t**2, t, 1), curve_matrix)
-                curve_vertexes.append((Coordinates(x, y)))
-                t += self.step
-            
-            curves_vertexes.append(curve_vertexes)
-            initial_vertex += 3
-        # End while
-
-        vertexes_clipped = list()
-        for curve_vertexes in curves_vertexes:
-            for vertex in curve_vertexes:
-                if (
-                    vertex.x >= const.WINDOW_NDC_MIN_X
-                    and vertex.x <= const.WINDOW_NDC_MAX_X
-                    and vertex.y >= const.WINDOW_NDC_MIN_Y
-                    and vertex.y <= const.WINDOW_NDC_MAX_Y
-                ):
-                    vertexes_clipped.append(deepcopy(vertex))
-
-        if len(vertexes_clipped) == 0:
+    def get_vertexes(self) -> ndarray:
+        return self.vertexes
+
+    def with_vertexes(self, vertexes: ndarray) -> Self:
+        return Curve2D(vertexes, self.color, self.step)
+
+    def get_segments(self) -> ndarray:
+        # (S, 4, 2) control points of every cubic segment, consecutive
+        # segments share their endpoints
+        segments_count = (len(self.vertexes) - 1) // 3
+        indexes = arange(segments_count)[:, None] * 3 + arange(4)
+        return self.vertexes[indexes]
+
+    def get_samples_count(
+        self, segments: ndarray, tolerance: float | None = None
+    ) -> ndarray:
+        if tolerance is None:
+            return full(len(segments), max(1, round(1 / self.step)))
+
+        # Wang's formula: with this many uniform steps the polyline stays
+        # within tolerance of the curve
+        second_differences = segments[:, :2] - 2 * segments[:, 1:3] + segments[:, 2:]
+        flatness = norm(second_differences, axis=2).max(axis=1)
+        samples_count = ceil(sqrt(0.75 * flatness / tolerance))
+        return samples_count.clip(1, const.CURVE_MAX_SAMPLES).astype(int)
+
+    def tessellate(self, tolerance: float | None = None) -> ndarray:
+        segments = self.get_segments()
+        if len(segments) == 0:
+            return empty((0, 2))
+
+        samples_count = self.get_samples_count(segments, tolerance)
+        vertexes = evaluate_bezier_segments(segments, samples_count)
+
+        return concatenate((segments[0, :1], vertexes))
+
+    def clip_NDC(
+        self, default: bool = True, tolerance: float | None = None
+    ) -> list[Curve2D_clipped] | None:
+        return self.clip_tessellated(tessellate_curves([self], tolerance)[0], default)
+
+    def clip_tessellated(
+        self, pieces: list[tuple[ndarray, ndarray]], default: bool = True
+    ) -> list[Curve2D_clipped] | None:
+        runs = list()
+        for vertexes, inside_edges in pieces:
+            runs.extend(clip_polyline(vertexes, default, inside_edges))
+
+        if len(runs) == 0:
             return None
-        
-        return [Curve2D_clipped(vertexes_clipped, self.color)]
\ No newline at end of file
+
+        return [Curve2D_clipped(run, self.color) for run in runs]
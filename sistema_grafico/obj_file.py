@@ -0,0 +1,217 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+import re
+
+from numpy import ndarray, asarray, empty, float64, fromstring, int64, isnan
+
+from model import (
+    Coordinates,
+    Point,
+    Line,
+    Wireframe,
+    Polyline,
+    Curve2D,
+    Drawable,
+    Color,
+    as_vertex_array,
+)
+
+# Bytes read from the file at a time, only whole lines of it are parsed
+READ_CHUNK_SIZE = 1 << 24
+# Vertexes and indexes formatted into a single string before being written
+WRITE_CHUNK_SIZE = 1 << 16
+WRITE_BUFFER_SIZE = 1 << 20
+
+# A run of consecutive vertex lines, or any other single line
+RECORD = re.compile(rb"((?:[ \t]*v[ \t][^\n]*\n)+)|([^\n]*)\n")
+NAME_RECORD = re.compile(rb"[og](?:[ \t]+(.*))?")
+ELEMENT_RECORD = re.compile(rb"([fpl])[ \t]+(.*)")
+
+
+@dataclass
+class Vertex_Buffer:
+    # Growing array of every 2D vertex read so far
+    _vertexes: ndarray = field(default_factory=lambda: empty((1024, 2), dtype=float64))
+    _size: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, vertexes: ndarray):
+        size = self._size + len(vertexes)
+        if size > len(self._vertexes):
+            capacity = max(size, 2 * len(self._vertexes))
+            grown = empty((capacity, 2), dtype=float64)
+            grown[: self._size] = self._vertexes[: self._size]
+            self._vertexes = grown
+
+        self._vertexes[self._size : size] = vertexes
+        self._size = size
+
+    def get(self, indexes: ndarray) -> ndarray:
+        # OBJ indexes start at 1, negative ones count back from the last vertex
+        indexes = indexes - 1
+        indexes[indexes < 0] += self._size + 1
+        if ((indexes < 0) | (indexes >= self._size)).any():
+            raise ValueError("Invalid .obj: Index of a missing vertex")
+        return self._vertexes[indexes]
+
+
+def parse_vertexes(run: bytes) -> ndarray:
+    lines_count = run.count(b"\n")
+    numbers_count = len(run[: run.index(b"\n")].split()) - 1
+
+    # Each v is read as a NaN, so the lines are all as wide as the first one
+    # only if every row starts with the only NaN in it
+    numbers = fromstring(run.replace(b"v", b" nan "), sep=" ")
+    if numbers_count >= 2 and len(numbers) == lines_count * (numbers_count + 1):
+        rows = numbers.reshape(lines_count, numbers_count + 1)
+        if isnan(rows[:, 0]).all() and isnan(numbers).sum() == lines_count:
+            return rows[:, 1:3]
+
+    # Lines with different amounts of numbers, z and w are ignored
+    return asarray(
+        [[float(number) for number in line.split()[1:3]] for line in run.splitlines()],
+        dtype=float64,
+    )
+
+
+def parse_indexes(references: bytes) -> ndarray:
+    # Only the vertex index of references like 1/2/3 is used
+    return asarray(
+        [int(reference.split(b"/")[0]) for reference in references.split()],
+        dtype=int64,
+    )
+
+
+def create_element(kind: bytes, vertexes: ndarray, color: Color) -> list[Drawable]:
+    match kind, len(vertexes):
+        case b"p", _:
+            return [Point(Coordinates(x, y), color) for x, y in vertexes.tolist()]
+
+        case _, 1:
+            return [Point(Coordinates(*vertexes[0].tolist()), color)]
+
+        case _, 2:
+            return [Line(*map(Coordinates.from_array, vertexes), color)]
+
+        case b"f", _:
+            return [Wireframe(vertexes, color, False)]
+
+        # A closed polyline is a wireframe
+        case b"l", _ if (vertexes[0] == vertexes[-1]).all():
+            return [Wireframe(vertexes[:-1], color, False)]
+
+        case b"l", _:
+            return [Polyline(vertexes, color)]
+
+
+def read_lines(path: Path | str) -> Iterator[bytes]:
+    # Whole lines of the file, in chunks of about READ_CHUNK_SIZE bytes
+    with Path(path).open("rb") as file:
+        rest = b""
+        while chunk := file.read(READ_CHUNK_SIZE):
+            chunk = rest + chunk
+            end = chunk.rfind(b"\n") + 1
+            rest = chunk[end:]
+            if end:
+                yield chunk[:end]
+        if rest:
+            yield rest + b"\n"
+
+
+def read_obj(
+    path: Path | str, color: Color = Color.BLACK
+) -> Iterator[tuple[str | None, Drawable]]:
+    # Every o or g group is read as its faces, polylines and points, named
+    # after the group, with a number after the first one. A group that comes
+    # back later in the file goes on with the same numbers
+    vertexes = Vertex_Buffer()
+    group_name = None
+    group_sizes: dict[str, int] = dict()
+
+    for lines in read_lines(path):
+        for match in RECORD.finditer(lines):
+            if match[1] is not None:
+                vertexes.extend(parse_vertexes(match[1]))
+                continue
+
+            line = match[2].strip()
+            if name_match := NAME_RECORD.fullmatch(line):
+                name = name_match[1]
+                group_name = name.decode().strip() if name else None
+                continue
+
+            element_match = ELEMENT_RECORD.fullmatch(line)
+            if element_match is None:
+                continue
+
+            kind, references = element_match.groups()
+            element = vertexes.get(parse_indexes(references))
+            for drawable in create_element(kind, element, color):
+                if group_name is None:
+                    yield None, drawable
+                    continue
+
+                group_size = group_sizes.get(group_name, 0) + 1
+                group_sizes[group_name] = group_size
+                if group_size == 1:
+                    yield group_name, drawable
+                else:
+                    yield f"{group_name}_{group_size}", drawable
+
+
+def write_vertexes(file: TextIO, vertexes: ndarray):
+    # The shortest repr of a float reads back as the same float
+    for start in range(0, len(vertexes), WRITE_CHUNK_SIZE):
+        chunk = vertexes[start : start + WRITE_CHUNK_SIZE]
+        file.write(("v %r %r 0\n" * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def write_element(file: TextIO, kind: str, first: int, count: int):
+    # Indexes first to first + count - 1, formatted a chunk at a time
+    file.write(kind)
+    for start in range(first, first + count, WRITE_CHUNK_SIZE):
+        end = min(start + WRITE_CHUNK_SIZE, first + count)
+        file.write(" " + " ".join(map(str, range(start, end))))
+    file.write("\n")
+
+
+def get_element(
+    drawable: Drawable, curves_tessellated: bool, curve_tolerance: float | None
+) -> tuple[str, ndarray]:
+    match drawable:
+        case Point():
+            return "p", as_vertex_array([drawable.coordinates])
+
+        case Line():
+            return "l", as_vertex_array([drawable.endpoint1, drawable.endpoint2])
+
+        case Wireframe():
+            return "f", drawable.vertexes
+
+        case Curve2D() if curves_tessellated:
+            return "l", drawable.tessellate(curve_tolerance)
+
+        # Curves are written as their control polygon by default
+        case Polyline() | Curve2D():
+            return "l", drawable.vertexes
+
+
+def write_obj(
+    file: TextIO,
+    drawables: Iterable[tuple[str, Drawable]],
+    curves_tessellated: bool = False,
+    curve_tolerance: float | None = None,
+):
+    # Each drawable is written as soon as it is read, all of them in a single
+    # vertex list
+    first = 1
+    for name, drawable in drawables:
+        kind, vertexes = get_element(drawable, curves_tessellated, curve_tolerance)
+
+        file.write(f"o {name}\n")
+        write_vertexes(file, vertexes)
+        write_element(file, kind, first, len(vertexes))
+        first += len(vertexes)
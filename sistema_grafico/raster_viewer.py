@@ -0,0 +1,220 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from struct import pack
+from typing import TYPE_CHECKING, Callable
+from zlib import crc32, compress
+
+from numpy import (
+    ndarray,
+    array,
+    full,
+    uint8,
+    int64,
+    arange,
+    repeat,
+    rint,
+    abs,
+    maximum,
+    hstack,
+    roll,
+    nonzero,
+    sort,
+    ceil,
+    floor,
+)
+
+if TYPE_CHECKING:
+    from controller import Controller
+
+from model import Coordinates, Area2d, Color
+
+VIEWPORT_MARGIN_SIZE = 50
+
+COLORS_RGB = {
+    Color.BLACK: (0, 0, 0),
+    Color.RED: (255, 0, 0),
+    Color.GREEN: (0, 128, 0),
+    Color.BLUE: (0, 0, 255),
+    Color.CYAN: (0, 255, 255),
+    Color.YELLOW: (255, 255, 0),
+    Color.MAGENTA: (255, 0, 255),
+}
+BACKGROUND_RGB = (255, 255, 255)
+
+
+def rasterize_segments(segments: ndarray) -> tuple[ndarray, ndarray]:
+    # DDA for every (x1, y1, x2, y2) row at once, returns the pixels columns
+    # and rows
+    x1, y1, x2, y2 = segments.T
+    steps = rint(maximum(abs(x2 - x1), abs(y2 - y1))).astype(int64) + 1
+
+    segment_of_pixel = repeat(arange(len(segments)), steps)
+    starts = steps.cumsum() - steps
+    t = (arange(steps.sum()) - starts[segment_of_pixel]) / maximum(
+        steps[segment_of_pixel] - 1, 1
+    )
+
+    x = x1[segment_of_pixel] + (x2 - x1)[segment_of_pixel] * t
+    y = y1[segment_of_pixel] + (y2 - y1)[segment_of_pixel] * t
+    return rint(x).astype(int64), rint(y).astype(int64)
+
+
+@dataclass
+class Raster_Viewer:
+    # Headless drawer that rasterizes into a NumPy RGB image
+    controller: Controller
+    width: int = 700
+    height: int = 700
+    _image: ndarray = field(init=False)
+    _viewport: Area2d = field(init=False)
+    _display_file_list: list[str] = field(default_factory=list)
+    # Callbacks the controller scheduled, run when update is called
+    _pending: list[Callable[[], None]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._viewport = Area2d(
+            Coordinates(VIEWPORT_MARGIN_SIZE, VIEWPORT_MARGIN_SIZE),
+            Coordinates(
+                self.width + VIEWPORT_MARGIN_SIZE, self.height + VIEWPORT_MARGIN_SIZE
+            ),
+        )
+        self._image = full(
+            (
+                self.height + 2 * VIEWPORT_MARGIN_SIZE,
+                self.width + 2 * VIEWPORT_MARGIN_SIZE,
+                3,
+            ),
+            BACKGROUND_RGB,
+            dtype=uint8,
+        )
+
+        self.controller.set_drawer(self)
+
+    def clear(self):
+        self._image[:] = BACKGROUND_RGB
+
+    def after_idle(self, callback: Callable[[], None]):
+        self._pending.append(callback)
+
+    def after(self, milliseconds: int, callback: Callable[[], None]):
+        # There is no event loop to wait in, the frame is drawn on update
+        self._pending.append(callback)
+
+    def update(self):
+        while self._pending:
+            pending, self._pending = self._pending, list()
+            for callback in pending:
+                callback()
+
+    def begin_drawable(self, name: str):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def insert_drawables(self, names: list[str]):
+        self._display_file_list.extend(names)
+
+    def clear_drawables(self):
+        self._display_file_list.clear()
+
+    def set_pixels(self, x: ndarray, y: ndarray, color: Color):
+        height, width = self._image.shape[:2]
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        self._image[y[inside], x[inside]] = COLORS_RGB[color]
+
+    def draw_segments(self, segments: ndarray, color: Color):
+        if len(segments):
+            self.set_pixels(*rasterize_segments(segments), color)
+
+    def draw_point(self, coordinates: Coordinates, color: Color):
+        # Same 4 pixels wide dot the canvas draws
+        offsets = arange(-2, 3)
+        x = repeat(offsets, len(offsets)) + round(coordinates.x)
+        y = hstack([offsets] * len(offsets)) + round(coordinates.y)
+        round_dot = (x - coordinates.x) ** 2 + (y - coordinates.y) ** 2 <= 4
+        self.set_pixels(x[round_dot], y[round_dot], color)
+
+    def draw_line(self, endpoint1: Coordinates, endpoint2: Coordinates, color: Color):
+        segment = array([[endpoint1.x, endpoint1.y, endpoint2.x, endpoint2.y]])
+        self.draw_segments(segment, color)
+
+    def draw_polyline(self, vertexes: ndarray, color: Color):
+        self.draw_segments(hstack((vertexes[:-1], vertexes[1:])), color)
+
+    def draw_polygon_outline(self, vertexes: ndarray, color: Color):
+        self.draw_segments(hstack((vertexes, roll(vertexes, -1, axis=0))), color)
+
+    def draw_wireframe_filled(self, vertexes: ndarray, color: Color):
+        following = roll(vertexes, -1, axis=0)
+        height, width = self._image.shape[:2]
+
+        # Even odd scanline fill, sampling each row at the pixel centers
+        first_row = max(int(floor(vertexes[:, 1].min())), 0)
+        last_row = min(int(ceil(vertexes[:, 1].max())), height - 1)
+        for row in range(first_row, last_row + 1):
+            y = row + 0.5
+            crossing = (vertexes[:, 1] <= y) != (following[:, 1] <= y)
+            indexes = nonzero(crossing)[0]
+            if len(indexes) < 2:
+                continue
+
+            start, end = vertexes[indexes], following[indexes]
+            t = (y - start[:, 1]) / (end[:, 1] - start[:, 1])
+            crossings = sort(start[:, 0] + (end[:, 0] - start[:, 0]) * t)
+
+            for x1, x2 in crossings.reshape(-1, 2).tolist():
+                first_column = max(int(ceil(x1 - 0.5)), 0)
+                last_column = min(int(floor(x2 - 0.5)), width - 1)
+                if first_column <= last_column:
+                    self._image[row, first_column : last_column + 1] = COLORS_RGB[color]
+
+        # The canvas polygon has no outline, but its edges are still covered
+        self.draw_segments(hstack((vertexes, following)), color)
+
+    def draw_viewport_border(self):
+        min_x, min_y = self._viewport.min.x, self._viewport.min.y
+        max_x, max_y = self._viewport.max.x, self._viewport.max.y
+        border = array(
+            [
+                (min_x, min_y, max_x, min_y),
+                (max_x, min_y, max_x, max_y),
+                (max_x, max_y, min_x, max_y),
+                (min_x, max_y, min_x, min_y),
+            ],
+            dtype=float,
+        )
+        self.draw_segments(border, Color.BLACK)
+
+    def get_image(self) -> ndarray:
+        return self._image.copy()
+
+    def save_ppm(self, path: Path | str):
+        height, width = self._image.shape[:2]
+        with Path(path).open("wb") as file:
+            file.write(f"P6\n{width} {height}\n255\n".encode())
+            file.write(self._image.tobytes())
+
+    def save_png(self, path: Path | str):
+        height, width = self._image.shape[:2]
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return pack(">I", len(data)) + kind + data + pack(">I", crc32(kind + data))
+
+        # Every row starts with filter type 0 (none)
+        rows = hstack(
+            (full((height, 1), 0, dtype=uint8), self._image.reshape(height, -1))
+        )
+
+        with Path(path).open("wb") as file:
+            file.write(b"\x89PNG\r\n\x1a\n")
+            file.write(chunk(b"IHDR", pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+            file.write(chunk(b"IDAT", compress(rows.tobytes())))
+            file.write(chunk(b"IEND", b""))
+
+    def save(self, path: Path | str):
+        if Path(path).suffix.lower() == ".ppm":
+            self.save_ppm(path)
+        else:
+            self.save_png(path)
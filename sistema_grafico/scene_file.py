@@ -0,0 +1,192 @@
+from os import replace
+from pathlib import Path
+from tempfile import mkstemp
+from typing import Iterable, Iterator
+
+from numpy import ndarray, array, asarray, dtype, empty, float64, memmap, uint8, zeros
+
+from model import (
+    Coordinates,
+    Area2d,
+    Point,
+    Line,
+    Wireframe,
+    Polyline,
+    Curve2D,
+    Drawable,
+    Color,
+)
+
+# A scene file is its header, every vertex as little endian float64 x and y
+# pairs, one record per object and the names of the objects as UTF-8
+SCENE_MAGIC = b"SGSCENE"
+SCENE_VERSION = 1
+
+SCENE_HEADER = dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("_padding", "<u4"),
+        ("objects_count", "<u8"),
+        ("vertexes_count", "<u8"),
+        ("names_size", "<u8"),
+        ("transformation_NDC", "<f8", (3, 3)),
+    ]
+)
+
+SCENE_OBJECT = dtype(
+    [
+        ("kind", "u1"),
+        ("color", "u1"),
+        ("filled", "u1"),
+        ("_padding", "u1", 5),
+        ("first", "<u8"),
+        ("count", "<u8"),
+        ("step", "<f8"),
+        ("bounding_box", "<f8", 4),
+        ("name_start", "<u8"),
+        ("name_length", "<u8"),
+    ]
+)
+
+KINDS = [Point, Line, Wireframe, Polyline, Curve2D]
+COLORS = list(Color)
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def get_vertexes(drawable: Drawable) -> ndarray:
+    # The ones a drawable is saved with, control points for curves
+    if isinstance(drawable, Curve2D):
+        return drawable.vertexes
+    return drawable.get_vertexes()
+
+
+def write_scene(
+    path: Path | str,
+    drawables: Iterable[tuple[str, Drawable]],
+    transformation_NDC: ndarray,
+):
+    drawables = list(drawables)
+    objects = zeros(len(drawables), dtype=SCENE_OBJECT)
+    names = [name.encode() for name, _ in drawables]
+
+    first = 0
+    name_start = 0
+    for i, (_, drawable) in enumerate(drawables):
+        bounding_box = drawable.get_bounding_box()
+        count = len(get_vertexes(drawable))
+
+        record = objects[i]
+        record["kind"] = KINDS.index(type(drawable))
+        record["color"] = COLORS.index(drawable.color)
+        record["filled"] = getattr(drawable, "filled", False)
+        record["first"] = first
+        record["count"] = count
+        record["step"] = getattr(drawable, "step", 0)
+        record["bounding_box"] = (
+            bounding_box.min.x,
+            bounding_box.min.y,
+            bounding_box.max.x,
+            bounding_box.max.y,
+        )
+        record["name_start"] = name_start
+        record["name_length"] = len(names[i])
+
+        first += count
+        name_start += len(names[i])
+
+    header = zeros(1, dtype=SCENE_HEADER)
+    header["magic"] = SCENE_MAGIC
+    header["version"] = SCENE_VERSION
+    header["objects_count"] = len(drawables)
+    header["vertexes_count"] = first
+    header["names_size"] = name_start
+    header["transformation_NDC"] = array(transformation_NDC, dtype=float64)
+
+    # The drawables of a loaded scene are still mapped from its file, so the
+    # scene is written apart and only then replaces the file
+    path = Path(path)
+    descriptor, temporary_path = mkstemp(
+        prefix=path.name, suffix=".tmp", dir=path.parent
+    )
+    try:
+        with open(descriptor, "wb", buffering=WRITE_BUFFER_SIZE) as file:
+            file.write(header.tobytes())
+            for _, drawable in drawables:
+                file.write(array(get_vertexes(drawable), dtype="<f8").tobytes())
+            file.write(objects.tobytes())
+            file.write(b"".join(names))
+        replace(temporary_path, path)
+    except BaseException:
+        Path(temporary_path).unlink(missing_ok=True)
+        raise
+
+
+def map_array(path: Path | str, data_type, offset: int, shape: tuple) -> ndarray:
+    if shape[0] == 0:
+        return empty(shape, dtype=data_type)
+    return memmap(path, dtype=data_type, mode="r", offset=offset, shape=shape)
+
+
+def read_scene(path: Path | str) -> tuple[ndarray, Iterator[tuple[str, Drawable]]]:
+    # Only the header, object records and names are read now, vertexes are
+    # mapped and read by the system when they are first used
+    header = map_array(path, SCENE_HEADER, 0, (1,))[0]
+    if header["magic"] != SCENE_MAGIC or header["version"] != SCENE_VERSION:
+        raise ValueError("Invalid scene file")
+
+    objects_count = int(header["objects_count"])
+    vertexes_count = int(header["vertexes_count"])
+    names_size = int(header["names_size"])
+
+    offset = SCENE_HEADER.itemsize
+    vertexes = map_array(path, "<f8", offset, (vertexes_count, 2))
+    offset += vertexes_count * 2 * 8
+    objects = array(map_array(path, SCENE_OBJECT, offset, (objects_count,)))
+    offset += objects_count * SCENE_OBJECT.itemsize
+    names = map_array(path, uint8, offset, (names_size,)).tobytes()
+
+    transformation_NDC = array(header["transformation_NDC"])
+    # Plain views of the map, slicing a memmap is several times slower
+    return transformation_NDC, read_drawables(asarray(vertexes), objects, names)
+
+
+def read_drawables(
+    vertexes: ndarray, objects: ndarray, names: bytes
+) -> Iterator[tuple[str, Drawable]]:
+    for kind, color, filled, first, count, step, box, name_start, name_length in zip(
+        objects["kind"].tolist(),
+        objects["color"].tolist(),
+        objects["filled"].tolist(),
+        objects["first"].tolist(),
+        objects["count"].tolist(),
+        objects["step"].tolist(),
+        objects["bounding_box"].tolist(),
+        objects["name_start"].tolist(),
+        objects["name_length"].tolist(),
+    ):
+        drawable_vertexes = vertexes[first : first + count]
+        color = COLORS[color]
+
+        kind = KINDS[kind]
+        if kind is Point:
+            drawable = Point(Coordinates(*drawable_vertexes[0].tolist()), color)
+        elif kind is Line:
+            endpoint1, endpoint2 = drawable_vertexes.tolist()
+            drawable = Line(Coordinates(*endpoint1), Coordinates(*endpoint2), color)
+        elif kind is Wireframe:
+            drawable = Wireframe(drawable_vertexes, color, bool(filled))
+        elif kind is Polyline:
+            drawable = Polyline(drawable_vertexes, color)
+        else:
+            drawable = Curve2D(drawable_vertexes, color, step)
+
+        # The saved bounding box lets the drawable be indexed without reading
+        # its vertexes
+        min_x, min_y, max_x, max_y = box
+        drawable.set_bounding_box(
+            Area2d(Coordinates(min_x, min_y), Coordinates(max_x, max_y))
+        )
+
+        yield names[name_start : name_start + name_length].decode(), drawable
@@ -0,0 +1,157 @@
+from dataclasses import dataclass, field
+from itertools import count
+from math import floor
+from statistics import median
+
+from model import Area2d
+
+# Drawables spanning more cells than this are kept apart and always tested
+MAX_CELLS_PER_DRAWABLE = 64
+
+
+@dataclass
+class Spatial_Index:
+    # Uniform grid over the world space bounding boxes of the display file
+    cell_size: float = 1.0
+    _cells: dict[tuple[int, int], set[str]] = field(default_factory=dict)
+    _boxes: dict[str, tuple[float, float, float, float]] = field(default_factory=dict)
+    _cell_ranges: dict[str, tuple[int, int, int, int]] = field(default_factory=dict)
+    _large: set[str] = field(default_factory=set)
+    # Insertion order, so queries keep the display file drawing order
+    _order: dict[str, int] = field(default_factory=dict)
+    _counter: count = field(default_factory=count)
+    _size_at_last_build: int = 0
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def get_cell_range(
+        self, box: tuple[float, float, float, float]
+    ) -> tuple[int, int, int, int]:
+        min_x, min_y, max_x, max_y = box
+        return (
+            floor(min_x / self.cell_size),
+            floor(min_y / self.cell_size),
+            floor(max_x / self.cell_size),
+            floor(max_y / self.cell_size),
+        )
+
+    def insert(self, name: str, box: Area2d) -> None:
+        if name in self._boxes:
+            self.remove(name)
+        else:
+            self._order[name] = next(self._counter)
+
+        box = (float(box.min.x), float(box.min.y), float(box.max.x), float(box.max.y))
+        self._boxes[name] = box
+        self.add_to_cells(name, box)
+
+        # The cell size follows the size of the drawables as the scene grows
+        if len(self._boxes) >= 2 * max(self._size_at_last_build, 16):
+            self.rebuild()
+
+    def insert_many(self, names: list[str], boxes: list[Area2d]) -> None:
+        # Same as inserting them one by one, with one rebuild at the end. A
+        # name given more than once keeps its last box
+        batch = dict(zip(names, boxes))
+        for name, box in batch.items():
+            if name in self._boxes:
+                self.remove(name)
+            else:
+                self._order[name] = next(self._counter)
+            self._boxes[name] = (
+                float(box.min.x),
+                float(box.min.y),
+                float(box.max.x),
+                float(box.max.y),
+            )
+
+        if len(self._boxes) >= 2 * max(self._size_at_last_build, 16):
+            self.rebuild()
+        else:
+            for name in batch:
+                self.add_to_cells(name, self._boxes[name])
+
+    def add_to_cells(self, name: str, box: tuple[float, float, float, float]):
+        cell_range = self.get_cell_range(box)
+        min_i, min_j, max_i, max_j = cell_range
+
+        if (max_i - min_i + 1) * (max_j - min_j + 1) > MAX_CELLS_PER_DRAWABLE:
+            self._large.add(name)
+            return
+
+        self._cell_ranges[name] = cell_range
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                self._cells.setdefault((i, j), set()).add(name)
+
+    def remove(self, name: str) -> None:
+        del self._boxes[name]
+
+        if name in self._large:
+            self._large.remove(name)
+            return
+
+        min_i, min_j, max_i, max_j = self._cell_ranges.pop(name)
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                cell = self._cells[(i, j)]
+                cell.discard(name)
+                if not cell:
+                    del self._cells[(i, j)]
+
+    def rebuild(self, cell_size: float | None = None) -> None:
+        if cell_size is None:
+            extents = [
+                max(max_x - min_x, max_y - min_y)
+                for min_x, min_y, max_x, max_y in self._boxes.values()
+            ]
+            cell_size = 2 * median(extents) if extents else self.cell_size
+
+        if cell_size > 0:
+            self.cell_size = cell_size
+
+        self._cells.clear()
+        self._cell_ranges.clear()
+        self._large.clear()
+        for name, box in self._boxes.items():
+            self.add_to_cells(name, box)
+        self._size_at_last_build = len(self._boxes)
+
+    def query(self, area: Area2d) -> list[str]:
+        # Names whose bounding box intersects the area, in insertion order
+        box = (
+            float(area.min.x),
+            float(area.min.y),
+            float(area.max.x),
+            float(area.max.y),
+        )
+        min_i, min_j, max_i, max_j = self.get_cell_range(box)
+
+        candidates = set()
+        if (max_i - min_i + 1) * (max_j - min_j + 1) > len(self._cells):
+            for (i, j), cell in self._cells.items():
+                if min_i <= i <= max_i and min_j <= j <= max_j:
+                    candidates.update(cell)
+        else:
+            for i in range(min_i, max_i + 1):
+                for j in range(min_j, max_j + 1):
+                    cell = self._cells.get((i, j))
+                    if cell:
+                        candidates.update(cell)
+        candidates.update(self._large)
+
+        min_x, min_y, max_x, max_y = box
+        names = list()
+        for name in candidates:
+            name_min_x, name_min_y, name_max_x, name_max_y = self._boxes[name]
+            if (
+                name_min_x <= max_x
+                and name_max_x >= min_x
+                and name_min_y <= max_y
+                and name_max_y >= min_y
+            ):
+                names.append(name)
+
+        names.sort(key=self._order.__getitem__)
+        return names
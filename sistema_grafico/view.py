@@ -17,15 +17,16 @@ from tkinter import (
     Checkbutton,
     messagebox,
 )
-from tkinter.filedialog import askopenfile, asksaveasfile
+from tkinter.filedialog import askopenfile, asksaveasfile, asksaveasfilename
 from pathlib import Path
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
     from controller import Controller
 
 from model import Coordinates, Area2d, Color
+from numpy import ndarray
 
 import re
 
@@ -49,6 +50,17 @@ class Graphic_Viewer:
     _canvas: Canvas = field(init=False)
     _display_file_list: Listbox = field(init=False)
     _viewport: Area2d = field(init=False)
+    # Canvas items of each display file name as (kind, options, id), reused
+    # between frames so only their coordinates change
+    _items: dict[str | None, list[tuple[str, tuple, int]]] = field(default_factory=dict)
+    _frame_items: dict[str | None, list[tuple[str, tuple, int]]] = field(
+        default_factory=dict
+    )
+    _current_name: str | None = None
+    _current_items: list[tuple[str, tuple, int]] = field(default_factory=list)
+    _created_items: set[int] = field(default_factory=set)
+    _viewport_border: int | None = None
+    _statistics_overlay: int | None = None
 
     def __post_init__(self):
         viewport_frame = Frame(self._main_window)
@@ -77,13 +89,101 @@ class Graphic_Viewer:
         self.controller.set_drawer(self)
 
     def clear(self):
-        self._canvas.delete("all")
-
-    def insert_drawable(self, name: str):
-        if name in self._display_file_list.get(0):
-            print(f"{name} already exists. Overwritting...")
+        # A frame left unfinished still has its items on the canvas, the ones
+        # it drew and the ones it did not get to reuse
+        for name, items in self._frame_items.items():
+            self._items[name] = items + self._items.get(name, [])[len(items) :]
+
+        # Items are only deleted at the end of the frame, if nothing reused them
+        self._frame_items = dict()
+        self.begin_drawable(None)
+
+    def after_idle(self, callback: Callable[[], None]):
+        self._main_window.after_idle(callback)
+
+    def after(self, milliseconds: int, callback: Callable[[], None]):
+        self._main_window.after(milliseconds, callback)
+
+    def begin_drawable(self, name: str | None):
+        self._current_name = name
+        self._current_items = list(reversed(self._items.get(name, ())))
+        self._frame_items[name] = list()
+
+    def end_frame(self):
+        statistics = self.controller.get_frame_statistics()
+        for name, items in self._items.items():
+            reused = len(self._frame_items.get(name, ()))
+            statistics.count("items_deleted", len(items[reused:]))
+            for _, _, item in items[reused:]:
+                self._canvas.delete(item)
+        self._items = self._frame_items
+        self._frame_items = dict()
+
+        # New items are created on top of the canvas, the ones drawn before
+        # a reused item are moved under it to keep the display file order
+        if self._created_items:
+            created_before = list()
+            for items in self._items.values():
+                for _, _, item in items:
+                    if item in self._created_items:
+                        created_before.append(item)
+                    else:
+                        for created in created_before:
+                            self._canvas.tag_lower(created, item)
+                        created_before.clear()
+            self._created_items = set()
+        if self._viewport_border is not None:
+            self._canvas.tag_raise(self._viewport_border)
+
+        # The statistics of this frame are complete once the controller is idle
+        if self.show_statistics.get():
+            self.after_idle(self.draw_statistics)
+
+        self.begin_drawable(None)
+
+    def draw_statistics(self):
+        text = self.controller.get_frame_statistics().get_summary()
+        if self._statistics_overlay is None:
+            self._statistics_overlay = self._canvas.create_text(
+                self._viewport.min.x + 5,
+                self._viewport.min.y + 5,
+                anchor="nw",
+                font=("TkFixedFont", 8),
+            )
+        self._canvas.itemconfigure(self._statistics_overlay, text=text)
+        self._canvas.tag_raise(self._statistics_overlay)
+
+    def hide_statistics(self):
+        if self._statistics_overlay is not None:
+            self._canvas.delete(self._statistics_overlay)
+            self._statistics_overlay = None
+
+    def draw_item(self, kind: str, coordinates: list[float], **options):
+        statistics = self.controller.get_frame_statistics()
+        options_key = tuple(sorted(options.items()))
+        reusable = self._current_items.pop() if self._current_items else None
+
+        if reusable is not None and reusable[0] == kind:
+            item = reusable[2]
+            self._canvas.coords(item, coordinates)
+            statistics.count("items_reused")
+            if reusable[1] != options_key:
+                self._canvas.itemconfigure(item, **options)
         else:
-            self._display_file_list.insert("end", name)
+            if reusable is not None:
+                self._canvas.delete(reusable[2])
+            item = getattr(self._canvas, "create_" + kind)(coordinates, **options)
+            self._created_items.add(item)
+            statistics.count("items_created")
+
+        self._frame_items[self._current_name].append((kind, options_key, item))
+
+    def insert_drawables(self, names: list[str]):
+        if names:
+            self._display_file_list.insert("end", *names)
+
+    def clear_drawables(self):
+        self._display_file_list.delete(0, "end")
 
     def ask_coordinates(self, coord_frame):
         point_x = Frame(coord_frame)
@@ -547,9 +647,10 @@ class Graphic_Viewer:
         with filepath.open("w") as file:
             file.write(content)
 
-    def import_item(self):
-        filepath = askopenfile(
+    def export_scene(self):
+        filepath = asksaveasfile(
             initialdir=Path(__file__).parents[1] / "export files",
+            initialfile="scene",
             defaultextension=".obj",
         )
 
@@ -558,13 +659,49 @@ class Graphic_Viewer:
 
         filepath = Path(filepath.name)
 
-        lines = list()
+        self.controller.export_scene(filepath)
 
-        with filepath.open() as file:
-            for line in file:
-                lines.append(line.strip())
+    def save_scene(self):
+        # Only the name is asked, opening the file would truncate the scene
+        # it may have been loaded from
+        filepath = asksaveasfilename(
+            initialdir=Path(__file__).parents[1] / "export files",
+            initialfile="scene",
+            defaultextension=".scene",
+        )
 
-        self.controller.import_obj(lines)
+        if not filepath:
+            return
+
+        filepath = Path(filepath)
+
+        self.controller.save_scene(filepath)
+
+    def open_scene(self):
+        filepath = askopenfile(
+            initialdir=Path(__file__).parents[1] / "export files",
+            defaultextension=".scene",
+        )
+
+        if not filepath:
+            return
+
+        filepath = Path(filepath.name)
+
+        self.controller.load_scene(filepath)
+
+    def import_item(self):
+        filepath = askopenfile(
+            initialdir=Path(__file__).parents[1] / "export files",
+            defaultextension=".obj",
+        )
+
+        if not filepath:
+            return
+
+        filepath = Path(filepath.name)
+
+        self.controller.import_obj(filepath)
 
     def init_window_function(self):
         window_function = Frame(
@@ -618,6 +755,18 @@ class Graphic_Viewer:
             display_file_frame, text="Import", command=lambda: self.import_item()
         ).pack()
 
+        Button(
+            display_file_frame, text="Export all", command=lambda: self.export_scene()
+        ).pack()
+
+        Button(
+            display_file_frame, text="Save scene", command=lambda: self.save_scene()
+        ).pack()
+
+        Button(
+            display_file_frame, text="Open scene", command=lambda: self.open_scene()
+        ).pack()
+
         create_frame = Frame(display_file_frame)
         create_frame.pack()
 
@@ -728,14 +877,57 @@ class Graphic_Viewer:
             command=lambda: self.controller.set_clip_default(False),
         ).pack()
 
-    def draw_point(self, drawable_coordinates: Coordinates, color: Color):
-        coordinates = self.controller.transform_window_to_viewport(drawable_coordinates)
+        Label(clipping_control_frame, text="Polygons").pack()
+
+        self.polygon_clip = IntVar(None, DEFAULT)
+
+        Radiobutton(
+            clipping_control_frame,
+            text="Weiler Atherton",
+            variable=self.polygon_clip,
+            value=DEFAULT,
+            command=lambda: self.controller.set_clip_polygon_default(True),
+        ).pack()
+
+        Radiobutton(
+            clipping_control_frame,
+            text="Sutherland Hodgman",
+            variable=self.polygon_clip,
+            value=NOT_DEFAULT,
+            command=lambda: self.controller.set_clip_polygon_default(False),
+        ).pack()
+
+        self.progressive_redraw = IntVar()
+
+        Checkbutton(
+            clipping_control_frame,
+            variable=self.progressive_redraw,
+            text="Progressive redraw",
+            command=lambda: self.controller.set_progressive_redraw(
+                bool(self.progressive_redraw.get())
+            ),
+        ).pack()
+
+        self.show_statistics = IntVar()
+
+        Checkbutton(
+            clipping_control_frame,
+            variable=self.show_statistics,
+            text="Frame statistics",
+            command=lambda: self.draw_statistics()
+            if self.show_statistics.get()
+            else self.hide_statistics(),
+        ).pack()
 
-        self._canvas.create_oval(
-            coordinates.x - 2,
-            coordinates.y - 2,
-            coordinates.x + 2,
-            coordinates.y + 2,
+    def draw_point(self, coordinates: Coordinates, color: Color):
+        self.draw_item(
+            "oval",
+            [
+                coordinates.x - 2,
+                coordinates.y - 2,
+                coordinates.x + 2,
+                coordinates.y + 2,
+            ],
             fill=color.value,
             outline="",
         )
@@ -745,33 +937,34 @@ class Graphic_Viewer:
         # self._canvas.create_oval(300, 300, 300+3, 300+3, fill="black", outline="")
 
     def draw_line(self, endpoint1: Coordinates, endpoint2: Coordinates, color: Color):
-        endpoint1 = self.controller.transform_window_to_viewport(endpoint1)
-        endpoint2 = self.controller.transform_window_to_viewport(endpoint2)
+        self.draw_item(
+            "line",
+            [endpoint1.x, endpoint1.y, endpoint2.x, endpoint2.y],
+            fill=color.value,
+        )
 
-        if endpoint1 and endpoint2:
-            self._canvas.create_line(
-                endpoint1.x, endpoint1.y, endpoint2.x, endpoint2.y, fill=color.value
-            )
+    def draw_polyline(self, vertexes: ndarray, color: Color):
+        self.draw_item("line", vertexes.ravel().tolist(), fill=color.value)
 
-    def draw_wireframe_filled(self, vertexes: list[Coordinates], color: Color):
-        vertexes_transformed = list()
-        for vertex in vertexes:
-            vertexes_transformed.append(
-                self.controller.transform_window_to_viewport(vertex)
-            )
-        x_and_y_alternating = list()
-        for vertex in vertexes_transformed:
-            x_and_y_alternating.append(vertex.x)
-            x_and_y_alternating.append(vertex.y)
-        self._canvas.create_polygon(x_and_y_alternating, fill=color.value)
+    def draw_polygon_outline(self, vertexes: ndarray, color: Color):
+        self.draw_item(
+            "polygon",
+            vertexes.ravel().tolist(),
+            fill="",
+            outline=color.value,
+        )
+
+    def draw_wireframe_filled(self, vertexes: ndarray, color: Color):
+        self.draw_item("polygon", vertexes.ravel().tolist(), fill=color.value)
 
     def draw_viewport_border(self):
-        self._canvas.create_rectangle(
-            self._viewport.min.x,
-            self._viewport.min.y,
-            self._viewport.max.x,
-            self._viewport.max.y,
-        )
+        if self._viewport_border is None:
+            self._viewport_border = self._canvas.create_rectangle(
+                self._viewport.min.x,
+                self._viewport.min.y,
+                self._viewport.max.x,
+                self._viewport.max.y,
+            )
 
     def run(self):
         self.draw_viewport_border()
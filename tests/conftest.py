@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+from typing import Callable
+
+# The modules of the system import each other by their plain names
+sys.path.insert(0, str(Path(__file__).parents[1] / "sistema_grafico"))
+
+import pytest
+
+from controller import Controller
+from raster_viewer import Raster_Viewer
+
+
+@pytest.fixture
+def create_controller() -> Callable[[], Controller]:
+    # Controllers drawing to a small headless viewer
+    def create() -> Controller:
+        controller = Controller()
+        Raster_Viewer(controller=controller, width=50, height=50)
+        return controller
+
+    return create
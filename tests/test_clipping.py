@@ -0,0 +1,110 @@
+from numpy import ndarray, array, float64
+from numpy.random import default_rng
+from numpy.testing import assert_allclose
+
+from model import (
+    Coordinates,
+    Line,
+    clip_segments,
+    clip_lines,
+    clip_polygon_Sutherland_Hodgman,
+)
+
+
+def random_segments(count: int) -> ndarray:
+    rng = default_rng(5420)
+    segments = rng.uniform(-3, 3, (count, 4))
+    # Some fully inside the window, on its borders, or of a single point
+    segments[: count // 10] /= 3
+    segments[count // 10 : count // 5, 0] = 1
+    segments[count // 5 : count // 4, 2:] = segments[count // 5 : count // 4, :2]
+    return segments
+
+
+def assert_batch_matches_scalar(default: bool):
+    segments = random_segments(2000)
+    clipped, keep = clip_segments(segments, default)
+
+    clipped = iter(clipped)
+    for (x1, y1, x2, y2), kept in zip(segments.tolist(), keep.tolist()):
+        line = Line(Coordinates(x1, y1), Coordinates(x2, y2))
+        if default:
+            expected = line.clip_line_Cohen_Sutherland()
+        else:
+            expected = line.clip_line_Liang_Barsky()
+
+        assert kept == (expected is not None)
+        if kept:
+            assert_allclose(next(clipped), expected.get_vertexes().ravel())
+
+
+def assert_clip_lines_matches_scalar(default: bool):
+    lines = [
+        Line(Coordinates(x1, y1), Coordinates(x2, y2))
+        for x1, y1, x2, y2 in random_segments(500).tolist()
+    ]
+
+    for line, clipped in zip(lines, clip_lines(lines, default)):
+        expected = line.clip_NDC(default)
+        if expected is None:
+            assert clipped is None
+        else:
+            assert_allclose(clipped.get_vertexes(), expected[0].get_vertexes())
+
+
+def test_batch_Cohen_Sutherland_matches_scalar():
+    assert_batch_matches_scalar(True)
+
+
+def test_clip_lines_Cohen_Sutherland_matches_scalar():
+    assert_clip_lines_matches_scalar(True)
+
+
+def test_batch_Liang_Barsky_matches_scalar():
+    assert_batch_matches_scalar(False)
+
+
+def test_clip_lines_Liang_Barsky_matches_scalar():
+    assert_clip_lines_matches_scalar(False)
+
+
+def clip_polygon_scalar(vertexes: list[tuple[float, float]]) -> list:
+    # Sutherland Hodgman a vertex at a time, against the NDC window
+    def intersection(start, end, axis, border):
+        t = (border - start[axis]) / (end[axis] - start[axis])
+        point = [start[0] + (end[0] - start[0]) * t, start[1] + (end[1] - start[1]) * t]
+        point[axis] = border
+        return tuple(point)
+
+    for axis, border, inside_below in (
+        (0, 1, True),
+        (1, -1, False),
+        (0, -1, False),
+        (1, 1, True),
+    ):
+        inside = (
+            (lambda vertex: vertex[axis] <= border)
+            if inside_below
+            else (lambda vertex: vertex[axis] >= border)
+        )
+        output = list()
+        for i, current in enumerate(vertexes):
+            following = vertexes[(i + 1) % len(vertexes)]
+            if inside(current) != inside(following):
+                output.append(intersection(current, following, axis, border))
+            if inside(following):
+                output.append(following)
+        vertexes = output
+
+    return vertexes
+
+
+def test_vectorized_Sutherland_Hodgman_matches_scalar():
+    rng = default_rng(5420)
+    for _ in range(500):
+        vertexes = rng.uniform(-2, 2, (int(rng.integers(3, 12)), 2))
+
+        clipped = clip_polygon_Sutherland_Hodgman(vertexes)
+        expected = clip_polygon_scalar([tuple(vertex) for vertex in vertexes.tolist()])
+
+        assert_allclose(clipped, array(expected, dtype=float64).reshape(-1, 2))
@@ -0,0 +1,74 @@
+from numpy import array, linspace, column_stack, sin
+
+from controller import Controller
+from raster_viewer import Raster_Viewer
+from model import Color, Coordinates, Wireframe
+
+
+def test_progressive_redraw_keeps_the_NDC_cache():
+    controller = Controller()
+    drawer = Raster_Viewer(controller=controller, width=50, height=50)
+    x = linspace(-1, 1, 2000)
+    lines = column_stack((x, x, x + 0.1, x - 0.1))
+    controller.create_lines(lines, Color.BLACK)
+    controller._redraw_chunk_size = 100
+    controller.set_progressive_redraw(True)
+    drawer.update()
+    drawables_NDC = dict(controller._display_file_NDC)
+
+    # Coarse and fine passes of a frame where nothing moved
+    controller.set_clip_default(False)
+    drawer.update()
+
+    assert all(
+        controller._display_file_NDC[name] is drawable
+        for name, drawable in drawables_NDC.items()
+    )
+
+
+def test_coarse_pass_simplifies_big_wireframes():
+    controller = Controller()
+    Raster_Viewer(controller=controller, width=50, height=50)
+    angles = linspace(0, 6.28, 4000, endpoint=False)
+    vertexes = column_stack((0.5 * sin(angles + 1.57), 0.5 * sin(angles)))
+    (name,) = controller.create_drawables([Wireframe(array(vertexes))])
+
+    controller.update_display_file_NDC([name], 8)
+    coarse = len(controller._display_file_NDC[name].vertexes)
+    controller.update_display_file_NDC([name], 1)
+    fine = len(controller._display_file_NDC[name].vertexes)
+
+    assert coarse < fine
+
+
+def test_redraw_evicts_drawables_out_of_the_window():
+    controller = Controller()
+    drawer = Raster_Viewer(controller=controller, width=50, height=50)
+    x = linspace(-0.9, 0.8, 200)
+    lines = column_stack((x, x, x + 0.1, x))
+    names = controller.create_lines(lines, Color.BLACK)
+    drawer.update()
+    assert set(names) <= set(controller._display_file_NDC)
+
+    controller.pan_window(Coordinates(1, 1), 1000)
+    drawer.update()
+
+    assert not controller._display_file_NDC
+    assert not controller._display_file_NDC_versions
+
+
+def test_changes_before_an_update_are_drawn_in_one_frame():
+    controller = Controller()
+    drawer = Raster_Viewer(controller=controller, width=50, height=50)
+
+    controller.create_point(0, 0, Color.RED)
+    controller.create_line(-1, -1, 1, 1, Color.BLUE)
+    controller.create_wireframe([0, 0.5, 0.5], [0, 0, 0.5], Color.GREEN, True)
+    controller.pan_window(Coordinates(1, 0), 0.1)
+    controller.pan_window(Coordinates(0, 1), 0.1)
+    assert controller.get_frame_statistics().get_frames() == []
+
+    drawer.update()
+    drawer.update()
+
+    assert len(controller.get_frame_statistics().get_frames()) == 1
@@ -0,0 +1,65 @@
+from numpy import ndarray, array, concatenate, linspace, full
+from numpy.testing import assert_allclose
+
+from model import (
+    Coordinates,
+    Wireframe,
+    Polyline,
+    Curve2D,
+    Curve2D_clipped,
+    as_vertex_array,
+    simplify_polygon,
+)
+
+
+def thin_outline(vertexes_count: int) -> ndarray:
+    # 100 x 0.4 rectangle outline, half of the vertexes on each long side
+    x = linspace(0, 100, vertexes_count // 2)
+    return concatenate(
+        (
+            array([x, full(len(x), 0.0)]).T,
+            array([x[::-1], full(len(x), 0.4)]).T,
+        )
+    )
+
+
+def test_simplify_thin_polygon():
+    vertexes = thin_outline(10000)
+
+    assert 3 <= len(simplify_polygon(vertexes, 0.1)) < 200
+    for tolerance in [1, 4]:
+        simplified = simplify_polygon(vertexes, tolerance)
+        assert len(simplified) == 3
+        assert_allclose(simplified.min(axis=0), [0, 0])
+        assert_allclose(simplified.max(axis=0), [100, 0.4])
+
+
+def test_curve_leaving_and_entering_the_window():
+    # Arch that goes out through the top of the window and comes back
+    curve = Curve2D(array([[-0.5, 0], [-0.5, 3], [0.5, 3], [0.5, 0]]))
+
+    for default in [True, False]:
+        first, second = curve.clip_NDC(default, 0.001)
+
+        assert type(first) is Curve2D_clipped and type(second) is Curve2D_clipped
+        assert_allclose(first.vertexes[0], [-0.5, 0])
+        assert_allclose(second.vertexes[-1], [0.5, 0])
+        # Each run ends on the border, with no chord drawn across the gap
+        assert_allclose([first.vertexes[-1, 1], second.vertexes[0, 1]], [1, 1])
+        assert first.vertexes[-1, 0] < 0 < second.vertexes[0, 0]
+        assert (first.vertexes[:, 1] <= 1).all() and (second.vertexes[:, 1] <= 1).all()
+
+
+def test_drawables_with_vertex_arrays_compare_by_identity():
+    vertexes = array([[0, 0], [1, 0], [0.5, 1], [1, 1]])
+
+    for kind in [Wireframe, Polyline, Curve2D, Curve2D_clipped]:
+        drawable = kind(vertexes)
+        assert drawable == drawable
+        assert drawable != kind(vertexes)
+
+
+def test_as_vertex_array_of_coordinates():
+    vertexes = as_vertex_array([Coordinates(0, 1), Coordinates(2, 3)])
+
+    assert_allclose(vertexes, [[0, 1], [2, 3]])
@@ -0,0 +1,115 @@
+from io import StringIO
+
+from numpy import array
+from numpy.testing import assert_array_equal
+
+from model import Coordinates, Point, Line, Wireframe, Polyline, Color
+from obj_file import read_obj, write_obj
+
+
+OBJ = (
+    "# Exported with CRLF line endings\r\n"
+    "g wall\r\n"
+    "v 0 0 0\r\n"
+    "v 1 0 0\r\n"
+    "v 1 1 0\r\n"
+    "vt 0 0\r\n"
+    "vn 0 0 1\r\n"
+    "f 1/1/1 2/1/1 3/1/1\r\n"
+    "g floor\r\n"
+    "v 2 2 0\r\n"
+    "v 3 2 0\r\n"
+    "l -2 -1\r\n"
+    "g wall\r\n"
+    "v 4 4 0\r\n"
+    "p -1\r\n"
+    "l 1//1 4 5 2\r\n"
+)
+
+
+def test_read_obj(tmp_path):
+    path = tmp_path / "scene.obj"
+    path.write_bytes(OBJ.encode())
+
+    names, drawables = zip(*read_obj(path, Color.RED))
+
+    assert names == ("wall", "floor", "wall_2", "wall_3")
+    assert [type(drawable) for drawable in drawables] == [
+        Wireframe,
+        Line,
+        Point,
+        Polyline,
+    ]
+    assert_array_equal(drawables[0].vertexes, [[0, 0], [1, 0], [1, 1]])
+    assert_array_equal(drawables[1].get_vertexes(), [[2, 2], [3, 2]])
+    assert drawables[2].coordinates == Coordinates(4, 4)
+    assert_array_equal(drawables[3].vertexes, [[0, 0], [2, 2], [3, 2], [1, 0]])
+    assert all(drawable.color == Color.RED for drawable in drawables)
+
+
+def test_read_vertex_lines_of_different_widths(tmp_path):
+    path = tmp_path / "scene.obj"
+    path.write_bytes(
+        b"v 1 2 3\nv 4 5 6 1\nv 7 8\n  v 9 10 0\n\tv 11 12 0\nl 1 2 3 4 5\n"
+    )
+
+    ((_, polyline),) = read_obj(path, Color.BLACK)
+
+    assert_array_equal(polyline.vertexes, [[1, 2], [4, 5], [7, 8], [9, 10], [11, 12]])
+
+
+def test_import_repeated_groups(tmp_path, create_controller):
+    path = tmp_path / "scene.obj"
+    path.write_bytes(OBJ.encode())
+
+    controller = create_controller()
+    names = controller.import_obj(path)
+
+    assert names == ["wall", "floor", "wall_2", "wall_3"]
+    assert list(controller._display_file) == names
+
+
+def test_obj_round_trip(tmp_path, create_controller):
+    scene = create_controller()
+    scene.create_drawables(
+        [
+            Point(Coordinates(0.5, -0.25)),
+            Line(Coordinates(-1, -1), Coordinates(2, 0.1)),
+            Wireframe(array([[0, 0], [1, 0], [0.5, 1 / 3]])),
+            Polyline(array([[0, 0], [0.5, 0.5], [1, 0], [1.5, 0.5]])),
+        ],
+        ["point", "line", "wireframe", "polyline"],
+    )
+    scene.export_scene(tmp_path / "scene.obj")
+
+    controller = create_controller()
+    controller.import_obj(tmp_path / "scene.obj")
+
+    assert list(controller._display_file) == list(scene._display_file)
+    for name, drawable in scene._display_file.items():
+        imported = controller._display_file[name]
+        assert type(imported) is type(drawable)
+        assert_array_equal(imported.get_vertexes(), drawable.get_vertexes())
+
+
+def test_write_obj_shares_vertex_indexes():
+    output = StringIO()
+    write_obj(
+        output,
+        [
+            ("a", Line(Coordinates(0, 0), Coordinates(1, 1))),
+            ("b", Wireframe(array([[0, 0], [1, 0], [1, 1]]))),
+        ],
+    )
+
+    assert output.getvalue().splitlines() == [
+        "o a",
+        "v 0.0 0.0 0",
+        "v 1.0 1.0 0",
+        "l 1 2",
+        "o b",
+        "v 0.0 0.0 0",
+        "v 1.0 0.0 0",
+        "v 1.0 1.0 0",
+        "f 3 4 5",
+    ]
@@ -0,0 +1,95 @@
+from struct import unpack
+from zlib import decompress
+
+from numpy import ndarray, frombuffer, uint8, zeros, nonzero
+from numpy.testing import assert_array_equal
+
+from controller import Controller
+from raster_viewer import Raster_Viewer, COLORS_RGB, BACKGROUND_RGB
+from model import Color
+
+
+def create_drawer() -> Raster_Viewer:
+    # The 50 x 50 viewport goes from pixel 50 to 100, so the world origin is
+    # drawn at pixel 75
+    return Raster_Viewer(controller=Controller(), width=50, height=50)
+
+
+def get_mask(image: ndarray, color: Color) -> ndarray:
+    return (image == COLORS_RGB[color]).all(axis=2)
+
+
+def read_png(data: bytes) -> ndarray:
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks = dict()
+    position = 8
+    while position < len(data):
+        (length,) = unpack(">I", data[position : position + 4])
+        kind = data[position + 4 : position + 8]
+        chunks[kind] = data[position + 8 : position + 8 + length]
+        position += length + 12
+
+    width, height, depth, color_type = unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (depth, color_type) == (8, 2)
+    rows = frombuffer(decompress(chunks[b"IDAT"]), dtype=uint8)
+    rows = rows.reshape(height, 1 + 3 * width)
+    assert (rows[:, 0] == 0).all()
+    return rows[:, 1:].reshape(height, width, 3)
+
+
+def read_ppm(data: bytes) -> ndarray:
+    kind, size, maximum, pixels = data.split(b"\n", 3)
+    assert (kind, maximum) == (b"P6", b"255")
+    width, height = map(int, size.split())
+    return frombuffer(pixels, dtype=uint8).reshape(height, width, 3)
+
+
+def test_draw_point():
+    drawer = create_drawer()
+    drawer.controller.create_point(0, 0, Color.RED)
+    drawer.update()
+
+    rows, columns = nonzero(get_mask(drawer.get_image(), Color.RED))
+    assert_array_equal(rows, [73, 74, 74, 74, 75, 75, 75, 75, 75, 76, 76, 76, 77])
+    assert_array_equal(columns, [75, 74, 75, 76, 73, 74, 75, 76, 77, 74, 75, 76, 75])
+
+
+def test_draw_line():
+    drawer = create_drawer()
+    drawer.controller.create_line(-0.4, 0.4, 0.4, 0.4, Color.BLUE)
+    drawer.update()
+
+    expected = zeros((150, 150), dtype=bool)
+    expected[65, 65:86] = True
+    assert_array_equal(get_mask(drawer.get_image(), Color.BLUE), expected)
+
+
+def test_draw_filled_triangle():
+    drawer = create_drawer()
+    drawer.controller.create_wireframe(
+        [-0.8, -0.2, -0.8], [-0.8, -0.8, -0.2], Color.GREEN, True
+    )
+    drawer.update()
+
+    # Right angle at the bottom left, from pixel 55 to 70 on both axes
+    expected = zeros((150, 150), dtype=bool)
+    for row in range(80, 96):
+        expected[row, 55 : 56 + row - 80] = True
+    assert_array_equal(get_mask(drawer.get_image(), Color.GREEN), expected)
+
+
+def test_saved_images_read_back(tmp_path):
+    drawer = create_drawer()
+    drawer.controller.create_point(0, 0, Color.RED)
+    drawer.controller.create_wireframe(
+        [-0.8, -0.2, -0.8], [-0.8, -0.8, -0.2], Color.GREEN, True
+    )
+    drawer.update()
+    image = drawer.get_image()
+    assert (image != BACKGROUND_RGB).any()
+
+    drawer.save(tmp_path / "frame.png")
+    drawer.save(tmp_path / "frame.ppm")
+
+    assert_array_equal(read_png((tmp_path / "frame.png").read_bytes()), image)
+    assert_array_equal(read_ppm((tmp_path / "frame.ppm").read_bytes()), image)
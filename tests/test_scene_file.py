@@ -0,0 +1,88 @@
+from typing import Callable
+
+from numpy import array
+from numpy.testing import assert_array_equal
+
+from controller import Controller
+from model import Coordinates, Point, Line, Wireframe, Polyline, Curve2D, Color
+
+
+def create_scene(create_controller: Callable[[], Controller]) -> Controller:
+    controller = create_controller()
+    controller.create_drawables(
+        [
+            Point(Coordinates(0.5, -0.25), Color.RED),
+            Line(Coordinates(-1, -1), Coordinates(2, 0.5), Color.BLUE),
+            Wireframe(array([[0, 0], [1, 0], [0.5, 1]]), Color.GREEN, True),
+            Polyline(array([[0, 0], [0.5, 0.5], [1, 0], [1.5, 0.5]]), Color.CYAN),
+            Curve2D(array([[0, 0], [0, 1], [1, 1], [1, 0]]), Color.MAGENTA, 0.01),
+        ],
+        ["point", "line", "wireframe", "polyline", "curve"],
+    )
+    controller.zoom(Coordinates(2, 2))
+    return controller
+
+
+def assert_same_scene(controller: Controller, expected: Controller):
+    assert list(controller._display_file) == list(expected._display_file)
+    assert_array_equal(controller._transformation_NDC, expected._transformation_NDC)
+
+    for name, drawable in expected._display_file.items():
+        loaded = controller._display_file[name]
+        assert type(loaded) is type(drawable)
+        assert loaded.color == drawable.color
+        assert getattr(loaded, "filled", None) == getattr(drawable, "filled", None)
+        assert getattr(loaded, "step", None) == getattr(drawable, "step", None)
+        assert_array_equal(loaded.get_vertexes(), drawable.get_vertexes())
+        assert loaded.get_bounding_box() == drawable.get_bounding_box()
+
+
+def test_scene_round_trip(tmp_path, create_controller):
+    scene = create_scene(create_controller)
+    scene.save_scene(tmp_path / "scene.scene")
+
+    controller = create_controller()
+    controller.load_scene(tmp_path / "scene.scene")
+
+    assert_same_scene(controller, scene)
+
+
+def test_save_over_the_loaded_scene(tmp_path, create_controller):
+    path = tmp_path / "scene.scene"
+    scene = create_scene(create_controller)
+    scene.save_scene(path)
+
+    # The loaded drawables are read from the same file they are saved to
+    controller = create_controller()
+    controller.load_scene(path)
+    controller.save_scene(path)
+
+    reloaded = create_controller()
+    reloaded.load_scene(path)
+
+    assert_same_scene(reloaded, scene)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_empty_scene_round_trip(tmp_path, create_controller):
+    create_controller().save_scene(tmp_path / "empty.scene")
+
+    controller = create_controller()
+    assert controller.load_scene(tmp_path / "empty.scene") == []
+    assert controller._display_file == {}
+
+
+def test_load_scene_replaces_the_display_file(tmp_path, create_controller):
+    create_scene(create_controller).save_scene(tmp_path / "scene.scene")
+
+    controller = create_controller()
+    controller.create_drawables(
+        [Point(Coordinates(0, 0)), Point(Coordinates(1, 1))], ["point", "other"]
+    )
+    controller.load_scene(tmp_path / "scene.scene")
+
+    names = ["point", "line", "wireframe", "polyline", "curve"]
+    assert list(controller._display_file) == names
+    assert controller._drawer._display_file_list == names
+    assert sorted(controller.get_visible_names()) == sorted(names)
+    assert controller._display_file["point"].color == Color.RED
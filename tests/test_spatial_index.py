@@ -0,0 +1,33 @@
+from model import Coordinates, Area2d
+from spatial_index import Spatial_Index
+
+
+def area(min_x: float, min_y: float, max_x: float, max_y: float) -> Area2d:
+    return Area2d(Coordinates(min_x, min_y), Coordinates(max_x, max_y))
+
+
+def test_insert_many_repeated_name_keeps_last_box():
+    index = Spatial_Index()
+    index.insert("first", area(0, 0, 1, 1))
+    index.insert_many(
+        ["wall", "floor", "wall", "first"],
+        [area(0, 0, 1, 1), area(2, 2, 3, 3), area(5, 5, 6, 6), area(8, 8, 9, 9)],
+    )
+
+    assert len(index) == 3
+    assert index.query(area(-1, -1, 1.5, 1.5)) == []
+    assert index.query(area(4, 4, 10, 10)) == ["first", "wall"]
+    assert index.query(area(-10, -10, 10, 10)) == ["first", "wall", "floor"]
+
+
+def test_insert_many_matches_insert():
+    names = [f"name{i}" for i in range(100)]
+    boxes = [area(i, i % 7, i + 0.5, i % 7 + 2) for i in range(100)]
+    one_by_one = Spatial_Index()
+    for name, box in zip(names, boxes):
+        one_by_one.insert(name, box)
+    batch = Spatial_Index()
+    batch.insert_many(names, boxes)
+
+    for query in [area(0, 0, 10, 10), area(20.2, 3, 40, 4), area(-5, -5, 200, 9)]:
+        assert batch.query(query) == one_by_one.query(query)